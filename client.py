@@ -1,99 +1,103 @@
 import asyncio
-import json
 
+import httpx
 from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
 
-client = Client("http://localhost:8000/api/mcp")
 
+def get_http_client(
+    headers: dict[str, str] | None = None,
+    timeout: httpx.Timeout | None = None,
+    auth: httpx.Auth | None = None,
+    **kwargs,
+) -> httpx.AsyncClient:
+    """Create the pooled httpx client used by the MCP transport.
 
-async def call_tool(name: str):
-    async with client:
-        result = await client.call_tool("health_check")
-        print(result)
+    Keep-alive connections are reused across tool calls, so only the first
+    call of a session pays for the TCP handshake. Extra keyword arguments
+    passed by the transport (e.g. follow_redirects) are forwarded to httpx.
+    """
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(30.0, read=300.0),
+        auth=auth,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+        **kwargs,
+    )
 
 
-async def shortest_path(graph_data: dict, source: str, target: str):
-    async with client:
-        # fastmcp Client.call_tool does not accept arbitrary kwargs for tool params;
-        # pass a single params dict as the second positional argument instead.
-        params = {"graph_data": graph_data, "source": source, "target": target}
-        result = await client.call_tool("shortest_path", params)
-        print(result)
+transport = StreamableHttpTransport("http://localhost:8000/api/mcp", httpx_client_factory=get_http_client)
+client = Client(transport)
 
 
-with open("data/example_graph.json") as f:
-    graph_data = json.load(f)
+async def call_tool(client: Client, name: str):
+    result = await client.call_tool("health_check")
+    print(result)
 
-asyncio.run(shortest_path(graph_data, "0", "19"))
 
+async def load_graph(client: Client, path: str, alias: str = "default") -> str:
+    # The graph is transmitted once; later calls reference it by URI.
+    params = {"path": path, "alias": alias}
+    result = await client.call_tool("load_graph_from_file", params)
+    print(result)
+    return f"graph://{alias}"
 
-async def find_nodes_by_attribute(graph_data: dict, attribute: str, value=None, operator: str = "=="):
-    async with client:
-        params = {
-            "graph_data": graph_data,
-            "attribute": attribute,
-            "value": value,
-            "operator": operator,
-        }
-        result = await client.call_tool("find_nodes_by_attribute", params)
-        print(result)
 
+async def shortest_path(client: Client, uri: str, source: str, target: str):
+    # fastmcp Client.call_tool does not accept arbitrary kwargs for tool params;
+    # pass a single params dict as the second positional argument instead.
+    params = {"graph_uri": uri, "source": source, "target": target}
+    result = await client.call_tool("shortest_path", params)
+    print(result)
 
-async def find_edges_by_attribute(graph_data: dict, attribute: str, value=None):
-    async with client:
-        params = {"graph_data": graph_data, "attribute": attribute, "value": value}
-        result = await client.call_tool("find_edges_by_attribute", params)
-        print(result)
 
+async def find_nodes_by_attribute(client: Client, uri: str, attribute: str, value=None, operator: str = "=="):
+    params = {
+        "uri": uri,
+        "attribute": attribute,
+        "value": value,
+        "operator": operator,
+    }
+    result = await client.call_tool("find_nodes_by_attribute", params)
+    print(result)
 
-async def matching_node_attribute(graph_data: dict, attribute: str, comparison: str):
-    async with client:
-        params = {
-            "graph_data": graph_data,
-            "attribute": attribute,
-            "comparison": comparison,
-        }
-        result = await client.call_tool("find_best_matching_node_attribute", params)
-        print(result)
 
+async def find_edges_by_attribute(client: Client, uri: str, attribute: str, value=None, operator: str = "=="):
+    params = {"uri": uri, "attribute": attribute, "value": value, "operator": operator}
+    result = await client.call_tool("find_edges_by_attribute", params)
+    print(result)
 
-async def matching_edge_attribute(graph_data: dict, attribute: str, comparison: str):
-    async with client:
-        params = {
-            "graph_data": graph_data,
-            "attribute": attribute,
-            "comparison": comparison,
-        }
-        result = await client.call_tool("find_best_matching_edge_attribute", params)
-        print(result)
 
+async def best_matching_edge_attribute(client: Client, uri: str, attribute: str):
+    params = {"request": {"uri": uri, "attribute": attribute}}
+    result = await client.call_tool("find_best_matching_edge_attribute", params)
+    print(result)
 
-async def best_matching_edge_attribute(graph_data: dict, attribute: str):
-    async with client:
-        params = {"graph_data": graph_data, "attribute": attribute}
-        result = await client.call_tool("find_best_matching_edge_attribute", params)
-        print(result)
 
+async def best_matching_node_attribute(client: Client, path: str, attribute: str, alias: str = "default") -> str:
+    # Loading and matching happen server-side in a single round trip.
+    params = {"path": path, "alias": alias, "attribute": attribute}
+    result = await client.call_tool("load_and_match", params)
+    print(result)
+    return f"graph://{alias}"
 
-async def best_matching_node_attribute(graph_data: dict, attribute: str):
+
+async def main():
+    # A single session is opened for all calls so the pooled connection is reused.
     async with client:
-        params = {"request": {"path": "data/sample_graph_attr.json", "alias": "test"}}
-        result = await client.call_tool("load_graph_from_file", params)
-        params = {"request": {"uri": "graph://test", "attribute": attribute}}
-        result = await client.call_tool("find_best_matching_node_attribute", params)
-        print(result)
+        uri = await load_graph(client, "data/example_graph.json", alias="example")
+        await shortest_path(client, uri, "0", "19")
+
+        uri = await best_matching_node_attribute(client, "data/sample_graph_attr.json", "ho", alias="sample")
+        # uri = await load_graph(client, "data/sap_supergraph.json", alias="sap")
 
+        # await find_nodes_by_attribute(client, uri, operator="<", attribute="holdup_max", value=100.0)
+        # await best_matching_edge_attribute(client, uri, "capacity")
 
-with open("data/sample_graph_attr.json") as f:
-    graph_data = json.load(f)
-# with open("data/sap_supergraph.json") as f:
-#     graph_data = json.load(f)
+        # await find_nodes_by_attribute(client, uri, "CM1")
 
-# asyncio.run(find_nodes_by_attribute(graph_data, operator= "<", attribute="holdup_max", value=100.0))
-# asyncio.run(matching_node_attribute(graph_data, "object_type", "a"))
-# asyncio.run(matching_edge_attribute(graph_data, "capacity", "1"))
-asyncio.run(best_matching_node_attribute(graph_data, "ho"))
+        # await find_edges_by_attribute(client, uri, "demand")
 
-# asyncio.run(find_nodes_by_attribute(graph_data, "CM1"))
 
-# asyncio.run(find_edges_by_attribute(graph_data, "demand",[]))
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,235 @@
+import threading
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional (install the 'jit' extra)
+    njit = None
+
+# Vectorized counterparts of operator_map, applied to whole attribute columns at once
+np_operator_map = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+# Integers up to this magnitude convert to float64 exactly, so comparing them with a float
+# in float64 agrees with Python, which compares int and float exactly.
+FLOAT_EXACT_INT_MAX = 2**53
+
+
+def compares_exactly(column: np.ndarray, values: list) -> bool:
+    """Return whether comparing a numeric column with a float in NumPy gives Python's results.
+
+    The column is np.array(values). Integer columns are promoted to float64 for the
+    comparison, and ints mixed with floats are converted to float64 by np.array already,
+    both of which round values beyond FLOAT_EXACT_INT_MAX, so columns only do if every
+    integer is within it. Bool columns always do.
+    """
+    kind = column.dtype.kind
+    if kind == "b":
+        return True
+    if kind in "iu":
+        return not column.size or (-FLOAT_EXACT_INT_MAX <= column.min() and column.max() <= FLOAT_EXACT_INT_MAX)
+    if kind == "f":
+        return all(-FLOAT_EXACT_INT_MAX <= val <= FLOAT_EXACT_INT_MAX for val in values if type(val) is int)
+    return False
+
+
+# Operator codes of the compiled compare kernel
+_op_codes = {"==": 0, "!=": 1, "<": 2, "<=": 3, ">": 4, ">=": 5}
+
+# Dense columns with more entries than this are compared by the parallel kernel when
+# numba is available; below it, NumPy is faster than the thread pool dispatch.
+PARALLEL_SCAN_MIN_SIZE = 1 << 16
+
+# Serializes kernel launches. Tools run concurrently in a thread pool, and numba's default
+# workqueue threading layer (used when neither TBB nor OpenMP is installed) aborts the
+# process on concurrent parallel launches. Each launch already uses every core.
+_kernel_lock = threading.Lock()
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _compare_mask(column, present, value, op_code, out):
+        """Set out[i] to whether present[i] and `column[i] <op> value`, in parallel over i."""
+        # One loop per operator, so the loop bodies are branch-free and vectorize
+        n = column.shape[0]
+        if op_code == 0:
+            for i in prange(n):
+                out[i] = present[i] & (column[i] == value)
+        elif op_code == 1:
+            for i in prange(n):
+                out[i] = present[i] & (column[i] != value)
+        elif op_code == 2:
+            for i in prange(n):
+                out[i] = present[i] & (column[i] < value)
+        elif op_code == 3:
+            for i in prange(n):
+                out[i] = present[i] & (column[i] <= value)
+        elif op_code == 4:
+            for i in prange(n):
+                out[i] = present[i] & (column[i] > value)
+        else:
+            for i in prange(n):
+                out[i] = present[i] & (column[i] >= value)
+
+
+# Range matches above this fraction of all ids are taken from a dense column scan,
+# which yields them in order, instead of sorting the matching positions.
+DENSE_SCAN_FRACTION = 0.25
+
+
+class _AttributeColumn:
+    """Lookup tables for the non-None values of one attribute."""
+
+    __slots__ = ("positions", "groups", "sorted_values", "sorted_positions", "dense", "present")
+
+    def __init__(self, positions: list[int], values: list, size: int):
+        self.positions = np.array(positions, dtype=np.intp)
+
+        # Equality lookups: value -> positions holding it (only if every value is hashable)
+        groups: dict[Any, list[int]] | None = {}
+        try:
+            for pos, val in zip(positions, values):
+                groups.setdefault(val, []).append(pos)
+        except TypeError:
+            groups = None
+        self.groups = None if groups is None else {val: np.array(pos, dtype=np.intp) for val, pos in groups.items()}
+
+        # Numeric lookups (only for purely numeric, NaN-free columns whose comparisons with
+        # a float agree with Python, including mixed int and float values, see
+        # compares_exactly): values sorted
+        # ascending for range lookups, plus a dense column aligned with all ids
+        # (structure of arrays) and a mask of the ids that have the attribute.
+        self.sorted_values = None
+        self.sorted_positions = None
+        self.dense = None
+        self.present = None
+        try:
+            column = np.array(values)
+        except (ValueError, TypeError, OverflowError):
+            column = None
+        if column is not None and column.ndim == 1 and compares_exactly(column, values) and not np.isnan(column).any():
+            order = np.argsort(column, kind="stable")
+            self.sorted_values = column[order]
+            self.sorted_positions = self.positions[order]
+            self.dense = np.zeros(size, dtype=column.dtype)
+            self.dense[self.positions] = column
+            self.present = np.zeros(size, dtype=bool)
+            self.present[self.positions] = True
+
+    def scan(self, value: float, operator: str) -> np.ndarray:
+        """Return the positions, in order, whose value satisfies the predicate, from the dense column."""
+        dense, present = self.dense, self.present
+        if dense is None or present is None:
+            raise ValueError("Only numeric attribute columns can be scanned")
+        if njit is not None and dense.shape[0] > PARALLEL_SCAN_MIN_SIZE:
+            mask = np.empty(dense.shape[0], dtype=np.bool_)
+            with _kernel_lock:
+                _compare_mask(dense, present, value, _op_codes[operator], mask)
+            return np.flatnonzero(mask)
+        return np.flatnonzero(np_operator_map[operator](dense, value) & present)
+
+
+class AttributeIndex:
+    """Precomputed attribute lookups over the nodes or edges of a graph.
+
+    The ``(id, attrs)`` pairs are collected once; the lookup tables of an
+    attribute are built on its first query, so attributes that are never queried
+    cost nothing. Equality predicates are answered with a dictionary lookup, range
+    predicates on numeric attributes with a binary search, or with a vectorized
+    scan of a dense column when they match a large share of ids. Results keep the
+    iteration order of the pairs the index was built from, so they match a full scan.
+    """
+
+    def __init__(self, items: Iterable[tuple[Hashable, dict]]):
+        self.ids: list = []
+        self._attrs: list[dict] = []
+        for item, attrs in items:
+            self.ids.append(item)
+            self._attrs.append(attrs)
+        self._columns: dict[str, _AttributeColumn | None] = {}
+
+    def _column(self, attribute: str) -> _AttributeColumn | None:
+        """Return the lookup tables of an attribute, building them on first use (None if no id has it)."""
+        try:
+            return self._columns[attribute]
+        except KeyError:
+            pass
+        positions, values = [], []
+        for pos, attrs in enumerate(self._attrs):
+            val = attrs.get(attribute)
+            if val is None:
+                continue
+            positions.append(pos)
+            values.append(val)
+        column = self._columns[attribute] = _AttributeColumn(positions, values, len(self.ids)) if positions else None
+        return column
+
+    def lookup(self, attribute: str, value: Any, operator: str) -> list | None:
+        """Return the ids whose attribute satisfies `attribute_value <operator> value`.
+
+        Parameters
+        ----------
+        attribute : str
+            Attribute key to test.
+        value : Any
+            If None, the predicate is "attribute exists and is not None".
+        operator : str
+            One of: '==', '!=', '<', '<=', '>', '>='.
+
+        Returns
+        -------
+        list | None
+            The matching ids, or None if the index cannot answer the predicate
+            (the caller should then fall back to a scan).
+        """
+        column = self._column(attribute)
+        if column is None:
+            return []
+        numeric = isinstance(value, float) and column.dense is not None
+        if value is None:
+            positions = column.positions
+        elif operator == "!=" and numeric:
+            positions = column.scan(value, operator)
+        elif operator in ("==", "!=") and column.groups is not None:
+            group = column.groups.get(value)
+            if operator == "==":
+                positions = group if group is not None else column.positions[:0]
+            else:
+                positions = (
+                    column.positions if group is None else np.setdiff1d(column.positions, group, assume_unique=True)
+                )
+        elif numeric:
+            if value != value:  # NaN never compares true
+                return []
+            # Always set together with the dense column, so this only narrows the types
+            sorted_values, sorted_positions = column.sorted_values, column.sorted_positions
+            if sorted_values is None or sorted_positions is None:
+                return None
+            match operator:
+                case "<":
+                    selected = sorted_positions[: np.searchsorted(sorted_values, value, "left")]
+                case "<=":
+                    selected = sorted_positions[: np.searchsorted(sorted_values, value, "right")]
+                case ">":
+                    selected = sorted_positions[np.searchsorted(sorted_values, value, "right") :]
+                case ">=":
+                    selected = sorted_positions[np.searchsorted(sorted_values, value, "left") :]
+                case _:
+                    return None
+            if len(selected) > DENSE_SCAN_FRACTION * len(self.ids):
+                positions = column.scan(value, operator)
+            else:
+                positions = np.sort(selected)
+        else:
+            return None
+        ids = self.ids
+        return [ids[i] for i in positions]
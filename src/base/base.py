@@ -1,7 +1,23 @@
+from itertools import count
+from typing import Any, Protocol
+
 import networkx as nx
 
 from src.classes import GraphDataModel
 
+_graph_classes: dict[tuple[bool, bool], type[nx.Graph]] = {
+    # (multigraph, directed) -> graph class
+    (True, True): nx.MultiDiGraph,
+    (True, False): nx.MultiGraph,
+    (False, True): nx.DiGraph,
+    (False, False): nx.Graph,
+}
+
+
+def _to_node(value):
+    """Convert a node-link node id to a hashable node (JSON lists become tuples)."""
+    return tuple(value) if isinstance(value, list) else value
+
 
 class Graph(nx.Graph):
     def __init__(self, graph_data: GraphDataModel):
@@ -10,15 +26,157 @@ class Graph(nx.Graph):
         self.graph: nx.Graph = self.create_graph()
 
     def create_graph(self) -> nx.Graph:
-        """Create a NetworkX graph from a node-link pydantic model."""
-        directed = self.graph_data.directed
+        """Create a NetworkX graph from a node-link pydantic model.
+
+        Nodes and edges are added directly instead of going through
+        nx.node_link_graph, with the same interpretation of the node-link keys:
+        'id' is the node, 'source'/'target' are the edge ends and, for
+        multigraphs, 'key' is the edge key. All other keys become attributes.
+        """
         multigraph = self.graph_data.multigraph
-        data = {
-            "multigraph": multigraph,
-            "directed": directed,
-            "graph": {},
-            "nodes": self.graph_data.nodes,
-            "links": self.graph_data.links,
-        }
-        G: nx.Graph = nx.node_link_graph(data, edges="links", directed=directed, multigraph=multigraph)
+        G: nx.Graph = _graph_classes[(multigraph, self.graph_data.directed)]()
+
+        c = count()
+        G.add_nodes_from(
+            (_to_node(node.get("id", next(c))), {k: v for k, v in node.items() if k != "id"})
+            for node in self.graph_data.nodes
+        )
+        if multigraph:
+            # The MultiGraph stubs inherit the (u, v[, attrs]) edge tuples of nx.Graph,
+            # but MultiGraph.add_edges_from also takes keyed (u, v, key, attrs) tuples.
+            G.add_edges_from(
+                (  # pyright: ignore[reportArgumentType]
+                    _to_node(link["source"]),
+                    _to_node(link["target"]),
+                    link.get("key"),
+                    {k: v for k, v in link.items() if k != "source" and k != "target" and k != "key"},
+                )
+                for link in self.graph_data.links
+            )
+        else:
+            G.add_edges_from(
+                (
+                    _to_node(link["source"]),
+                    _to_node(link["target"]),
+                    {k: v for k, v in link.items() if k != "source" and k != "target"},
+                )
+                for link in self.graph_data.links
+            )
         return G
+
+
+class AttributeGraph(Protocol):
+    """The subset of the nx.Graph API that attribute queries use.
+
+    Implemented by nx.Graph and its subclasses and by GraphAttributeView. ``nodes``
+    and ``edges`` are typed as Any-valued properties: nx.Graph declares them as
+    cached properties, which pyright does not match against a protocol otherwise.
+    """
+
+    @property
+    def nodes(self) -> Any: ...
+
+    @property
+    def edges(self) -> Any: ...
+
+    def is_multigraph(self) -> bool: ...
+
+
+class GraphAttributeView:
+    """Node and edge attributes of node-link data, without building a NetworkX graph.
+
+    Attribute queries only iterate over ``(node, attrs)`` and ``(u, v[, key], attrs)``,
+    so this view skips the adjacency structures (and, for directed graphs, the
+    predecessor maps) of a full graph. It supports the subset of the nx.Graph API
+    those queries use: ``nodes(data=True)``, ``edges(keys=..., data=True)`` and
+    ``is_multigraph()``. Nodes, edges and their attributes are merged and ordered
+    exactly as nx.Graph would report them for the same data, and None node ids are
+    rejected with the same ValueError.
+    """
+
+    def __init__(self, graph_data: GraphDataModel):
+        self._multigraph = multigraph = graph_data.multigraph
+        directed = graph_data.directed
+
+        c = count()
+        node_attrs: dict = {}
+        for node in graph_data.nodes:
+            n = _to_node(node.get("id", next(c)))
+            if n is None:
+                raise ValueError("None cannot be a node")
+            attrs = {k: v for k, v in node.items() if k != "id"}
+            if n in node_attrs:
+                node_attrs[n].update(attrs)
+            else:
+                node_attrs[n] = attrs
+
+        # Neighbors in insertion order only, to reproduce the edge order and merging of nx.Graph
+        adj: dict = {n: {} for n in node_attrs}
+        for link in graph_data.links:
+            u, v = _to_node(link["source"]), _to_node(link["target"])
+            if u is None or v is None:
+                raise ValueError("None cannot be a node")
+            for n in (u, v):
+                if n not in adj:
+                    adj[n] = {}
+                    node_attrs[n] = {}
+            if multigraph:
+                attrs = {k: val for k, val in link.items() if k != "source" and k != "target" and k != "key"}
+                keydict = adj[u].get(v)
+                if keydict is None:
+                    keydict = adj[u][v] = {}
+                    if not directed:
+                        adj[v][u] = keydict
+                key = link.get("key")
+                if key is None:
+                    key = len(keydict)
+                    while key in keydict:
+                        key += 1
+                if key in keydict:
+                    keydict[key].update(attrs)
+                else:
+                    keydict[key] = attrs
+            else:
+                attrs = {k: val for k, val in link.items() if k != "source" and k != "target"}
+                existing = adj[u].get(v)
+                if existing is not None:
+                    existing.update(attrs)
+                else:
+                    adj[u][v] = attrs
+                    if not directed:
+                        adj[v][u] = attrs
+
+        self._nodes = list(node_attrs.items())
+        seen = set()
+        self._edges = []
+        for u, nbrs in adj.items():
+            for v, data in nbrs.items():
+                if v in seen:
+                    continue
+                if multigraph:
+                    self._edges.extend((u, v, key, attrs) for key, attrs in data.items())
+                else:
+                    self._edges.append((u, v, data))
+            if not directed:
+                seen.add(u)
+
+    def is_multigraph(self) -> bool:
+        return self._multigraph
+
+    def nodes(self, data: bool = False) -> list:
+        if data:
+            return self._nodes
+        return [n for n, _ in self._nodes]
+
+    def edges(self, keys: bool = False, data: bool = False) -> list:
+        if self._multigraph:
+            if keys and data:
+                return self._edges
+            if keys:
+                return [(u, v, k) for u, v, k, _ in self._edges]
+            if data:
+                return [(u, v, d) for u, v, _, d in self._edges]
+            return [(u, v) for u, v, _, _ in self._edges]
+        if data:
+            return self._edges
+        return [(u, v) for u, v, _ in self._edges]
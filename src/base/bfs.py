@@ -0,0 +1,140 @@
+"""Breadth-first path search over the adjacency of NetworkX graphs."""
+
+from typing import Any
+
+import networkx as nx
+
+
+def bfs_path(G: nx.Graph, source: Any, target: Any) -> list | None:
+    """Return an unweighted shortest path from source to target, or None if there is none.
+
+    A bidirectional breadth-first search that always expands the smaller frontier and
+    stops where the two searches meet, like nx.bidirectional_shortest_path, and so
+    returns the same path. It iterates over the graph's adjacency dicts (successors
+    forward and predecessors backward for directed graphs) instead of the AtlasView
+    wrappers of ``G.adj``, and skips the NetworkX dispatch machinery.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        Input graph.
+    source : Any
+        Start node. Must be in G.
+    target : Any
+        End node. Must be in G.
+
+    Returns
+    -------
+    list | None
+        The nodes of the path from source to target, or None if target is not
+        reachable from source.
+    """
+    if source == target:
+        return [source]
+    return _bidirectional_search(*_adjacency_dicts(G), source, target)
+
+
+class IndexedAdjacency:
+    """The adjacency of a graph over integer node positions, for repeated path searches.
+
+    Nodes are numbered in graph order and the successors (and, for directed graphs,
+    the predecessors) of every node are stored as lists of positions, so a search
+    steps through lists of ints instead of looking up the dict of every node it
+    expands. It is built once per cached graph and must not be mutated.
+
+    Parameters
+    ----------
+    G : networkx.Graph
+        The graph to index. Later changes to G are not reflected.
+    """
+
+    __slots__ = ("nodes", "positions", "succ", "pred")
+
+    def __init__(self, G: nx.Graph):
+        succ, pred = _adjacency_dicts(G)
+        self.nodes: list = list(succ)
+        positions = self.positions = {node: i for i, node in enumerate(self.nodes)}
+        self.succ: list[list[int]] = [[positions[w] for w in nbrs] for nbrs in succ.values()]
+        self.pred: list[list[int]] = (
+            [[positions[w] for w in nbrs] for nbrs in pred.values()] if pred is not succ else self.succ
+        )
+
+    def path(self, source: Any, target: Any) -> list | None:
+        """Return the same path as bfs_path on the indexed graph, or None if there is none.
+
+        Raises
+        ------
+        networkx.NodeNotFound
+            If source or target is not in the indexed graph.
+        """
+        positions = self.positions
+        if source not in positions or target not in positions:
+            raise nx.NodeNotFound(f"Either source {source} or target {target} is not in the indexed graph")
+        if source == target:
+            return [source]
+        path = _bidirectional_search(self.succ, self.pred, positions[source], positions[target])
+        if path is None:
+            return None
+        nodes = self.nodes
+        return [nodes[i] for i in path]
+
+
+def _bidirectional_search(succ, pred, source: Any, target: Any) -> list | None:
+    """Search from source along succ and from target along pred until the searches meet.
+
+    succ and pred map each node to an iterable of its neighbors, as dicts of the
+    adjacency of a graph or as lists indexed by node position.
+    """
+    # Parent of each reached node on its way to source (forward) or to target (backward).
+    # No node is reached by both searches before they meet, so a neighbor already
+    # reached from the same side is skipped with a single lookup.
+    forward = {source: None}
+    backward = {target: None}
+    forward_fringe = [source]
+    backward_fringe = [target]
+    while forward_fringe and backward_fringe:
+        if len(forward_fringe) <= len(backward_fringe):
+            level, forward_fringe = forward_fringe, []
+            for v in level:
+                for w in succ[v]:
+                    if w in forward:
+                        continue
+                    forward[w] = v
+                    if w in backward:
+                        return _join(forward, backward, w)
+                    forward_fringe.append(w)
+        else:
+            level, backward_fringe = backward_fringe, []
+            for v in level:
+                for w in pred[v]:
+                    if w in backward:
+                        continue
+                    backward[w] = v
+                    if w in forward:
+                        return _join(forward, backward, w)
+                    backward_fringe.append(w)
+    return None
+
+
+def _join(forward: dict, backward: dict, meet: Any) -> list:
+    """Join the parent chains of the two searches at the node where they meet."""
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = forward[node]
+    path.reverse()
+    node = backward[meet]
+    while node is not None:
+        path.append(node)
+        node = backward[node]
+    return path
+
+
+def _adjacency_dicts(G: nx.Graph) -> tuple[dict, dict]:
+    """Return the successor and predecessor dicts of G (the same dict if undirected)."""
+    # The plain dicts behind G.adj and G.pred. They are private attributes of nx.Graph
+    # and so missing from its stubs, but reading them skips the views' wrappers.
+    succ = G._adj  # pyright: ignore[reportAttributeAccessIssue]
+    pred = G._pred if G.is_directed() else succ  # pyright: ignore[reportAttributeAccessIssue]
+    return succ, pred
@@ -1,9 +1,17 @@
+import heapq
 import operator
 from abc import ABC, abstractmethod
+from collections.abc import Collection, Mapping
+from itertools import chain, islice
 from typing import Any, Literal
 
 import networkx as nx
-from loguru import logger
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from src.base.attribute_index import AttributeIndex, compares_exactly, np_operator_map
+from src.base.base import AttributeGraph
+from src.base.bfs import IndexedAdjacency, bfs_path
 
 operator_map = {
     "==": operator.eq,
@@ -14,6 +22,54 @@ operator_map = {
     ">=": operator.ge,
 }
 
+# Scans over (id, attrs) pairs, one per operator so that the comparison is inlined
+# in the loop instead of going through an operator_map call for every item.
+_scan_filters = {
+    "==": lambda items, attribute, value: [
+        item for item, attrs in items if (item_val := attrs.get(attribute)) is not None and item_val == value
+    ],
+    "!=": lambda items, attribute, value: [
+        item for item, attrs in items if (item_val := attrs.get(attribute)) is not None and item_val != value
+    ],
+    "<": lambda items, attribute, value: [
+        item for item, attrs in items if (item_val := attrs.get(attribute)) is not None and item_val < value
+    ],
+    "<=": lambda items, attribute, value: [
+        item for item, attrs in items if (item_val := attrs.get(attribute)) is not None and item_val <= value
+    ],
+    ">": lambda items, attribute, value: [
+        item for item, attrs in items if (item_val := attrs.get(attribute)) is not None and item_val > value
+    ],
+    ">=": lambda items, attribute, value: [
+        item for item, attrs in items if (item_val := attrs.get(attribute)) is not None and item_val >= value
+    ],
+}
+
+# The same scans over (u, v, attrs) or (u, v, key, attrs) edge tuples, returning (u, v[, key])
+_edge_scan_filters = {
+    "==": lambda edges, attribute, value: [
+        edge[:-1] for edge in edges if (edge_val := edge[-1].get(attribute)) is not None and edge_val == value
+    ],
+    "!=": lambda edges, attribute, value: [
+        edge[:-1] for edge in edges if (edge_val := edge[-1].get(attribute)) is not None and edge_val != value
+    ],
+    "<": lambda edges, attribute, value: [
+        edge[:-1] for edge in edges if (edge_val := edge[-1].get(attribute)) is not None and edge_val < value
+    ],
+    "<=": lambda edges, attribute, value: [
+        edge[:-1] for edge in edges if (edge_val := edge[-1].get(attribute)) is not None and edge_val <= value
+    ],
+    ">": lambda edges, attribute, value: [
+        edge[:-1] for edge in edges if (edge_val := edge[-1].get(attribute)) is not None and edge_val > value
+    ],
+    ">=": lambda edges, attribute, value: [
+        edge[:-1] for edge in edges if (edge_val := edge[-1].get(attribute)) is not None and edge_val >= value
+    ],
+}
+
+# Minimum partial similarity (0-100) for an attribute name to count as a match
+MATCH_SCORE_CUTOFF = 80
+
 
 class BaseGraph(ABC):
 
@@ -59,14 +115,20 @@ class NetworkXGraph(BaseGraph):
 
     @classmethod
     def nodes_by_attribute(
-        cls, G: nx.Graph, attribute: str, value: Any | None = None, operator: str = "==", **kwargs
+        cls,
+        G: AttributeGraph,
+        attribute: str,
+        value: Any | None = None,
+        operator: str = "==",
+        index: AttributeIndex | None = None,
+        **kwargs,
     ) -> list:
         """Return node IDs whose node attribute matches a predicate.
 
         Parameters
         ----------
-        G : networkx.Graph
-            Input graph.
+        G : AttributeGraph
+            Input graph, or an attribute view of one.
         attribute : str
             Node attribute key to test.
         value : Any | None
@@ -74,6 +136,9 @@ class NetworkXGraph(BaseGraph):
             Otherwise, compare the node's attribute value to this value.
         operator : str
             One of: '==', '!=', '<', '<=', '>', '>='.
+        index : AttributeIndex | None
+            Optional precomputed node attribute index of G. When given and able to
+            answer the predicate, the scan over all nodes is skipped.
 
         Returns
         -------
@@ -83,75 +148,175 @@ class NetworkXGraph(BaseGraph):
         if operator not in operator_map:
             raise ValueError(f"Unsupported operator '{operator}'. Supported: {sorted(operator_map.keys())}")
         value = cls.type_cast(value)
-        logger.info(f"Type-cast value: {value} (type: {type(value)})")
-        logger.info(f"Finding nodes with attribute '{attribute}' {operator} '{value}'")
-        logger.info(f"Using operator function: {operator_map[operator]}")
+        if index is not None and (matching_nodes := index.lookup(attribute, value, operator)) is not None:
+            return matching_nodes
         if value is None:
-            matching_nodes = [node for node, attrs in G.nodes(data=True) if attrs.get(attribute) is not None]
-        else:
-            operator_func = operator_map[operator]
-            matching_nodes = []
-            for node, attrs in G.nodes(data=True):
-                node_val = attrs.get(attribute, None)
-                if node_val is None:
-                    continue
-                if operator_func(node_val, value):
-                    matching_nodes.append(node)
-        return matching_nodes
+            return [node for node, attrs in G.nodes(data=True) if attrs.get(attribute) is not None]
+        if isinstance(value, float):
+            return cls._compare_column(*cls._attribute_column(G.nodes(data=True), attribute), value, operator)
+        return _scan_filters[operator](G.nodes(data=True), attribute, value)
 
     @classmethod
     def edges_by_attribute(
-        cls, G: nx.Graph, attribute: str, value: Any | None = None, operator: str = "==", **kwargs
+        cls,
+        G: AttributeGraph,
+        attribute: str,
+        value: Any | None = None,
+        operator: str = "==",
+        index: AttributeIndex | None = None,
+        **kwargs,
     ) -> list:
         if operator not in operator_map:
             raise ValueError(f"Unsupported operator '{operator}'. Supported: {sorted(operator_map.keys())}")
         value = cls.type_cast(value)
-        logger.info(f"Type-cast value: {value} (type: {type(value)})")
-        logger.info(f"Finding edges with attribute '{attribute}' {operator} '{value}'")
-        logger.info(f"Using operator function: {operator_map[operator]}")
-        if G.is_multigraph():
-            if value is None:
-                return [
-                    (u, v, k) for u, v, k, attrs in G.edges(keys=True, data=True) if attrs.get(attribute) is not None
-                ]
-            operator_func = operator_map[operator]
-            matches = []
-            for u, v, k, attrs in G.edges(keys=True, data=True):
-                edge_val = attrs.get(attribute)
-                if edge_val is None:
-                    continue
-                if operator_func(edge_val, value):
-                    matches.append((u, v, k))
-            return matches
-        else:
-            if value is None:
-                return [(u, v) for u, v, attrs in G.edges(data=True) if attrs.get(attribute) is not None]
-            operator_func = operator_map[operator]
-            matches = []
-            for u, v, attrs in G.edges(data=True):
-                edge_val = attrs.get(attribute)
-                if edge_val is None:
-                    continue
-                if operator_func(edge_val, value):
-                    matches.append((u, v))
+        if index is not None and (matches := index.lookup(attribute, value, operator)) is not None:
             return matches
+        if isinstance(value, float):
+            return cls._compare_column(*cls._attribute_column(cls.edge_items(G), attribute), value, operator)
+        # Iterated as plain tuples, sliced into the edge id, instead of through the
+        # (edge, attrs) pairs of edge_items, which are built per edge.
+        edges = G.edges(keys=True, data=True) if G.is_multigraph() else G.edges(data=True)
+        if value is None:
+            return [edge[:-1] for edge in edges if edge[-1].get(attribute) is not None]
+        return _edge_scan_filters[operator](edges, attribute, value)
+
+    @staticmethod
+    def shortest_path(G: nx.Graph, source: Any, target: Any, adjacency: IndexedAdjacency | None = None) -> list:
+        """Return an unweighted shortest path from source to target.
+
+        Searches from both ends and stops where the frontiers meet (successors
+        forward and predecessors backward for directed graphs), using bfs_path.
+        A path from a node to itself is returned without any search. If the
+        integer-indexed adjacency of G is given, the search runs over it instead
+        and returns the same path.
+
+        Raises
+        ------
+        networkx.NodeNotFound
+            If source or target is not in G, or not in the given adjacency.
+        networkx.NetworkXNoPath
+            If target is not reachable from source.
+        """
+        if source not in G or target not in G:
+            raise nx.NodeNotFound(f"Either source {source} or target {target} is not in G")
+        path = bfs_path(G, source, target) if adjacency is None else adjacency.path(source, target)
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return path
+
+    @staticmethod
+    def edge_items(G: AttributeGraph):
+        """Yield (edge, attrs) pairs, where edge is (u, v, key) for MultiGraphs and (u, v) otherwise."""
+        if G.is_multigraph():
+            return (((u, v, k), attrs) for u, v, k, attrs in G.edges(keys=True, data=True))
+        return (((u, v), attrs) for u, v, attrs in G.edges(data=True))
+
+    @staticmethod
+    def _attribute_column(items, attribute: str) -> tuple[list, list]:
+        """Split (id, attrs) pairs into parallel lists of ids and non-None attribute values."""
+        ids, values = [], []
+        for item, attrs in items:
+            item_val = attrs.get(attribute)
+            if item_val is None:
+                continue
+            ids.append(item)
+            values.append(item_val)
+        return ids, values
+
+    @staticmethod
+    def _compare_column(ids: list, values: list, value: Any, operator: str) -> list:
+        """Return the ids whose attribute value satisfies `attribute_value <operator> value`.
+
+        Purely numeric columns compared against a float are evaluated with a single
+        NumPy ufunc call, unless they hold integers that float64 would round; anything
+        else falls back to Python comparison semantics.
+        """
+        if isinstance(value, float) and values:
+            try:
+                column = np.array(values)
+            except (ValueError, TypeError, OverflowError):
+                column = None
+            if column is not None and column.ndim == 1 and compares_exactly(column, values):
+                mask = np_operator_map[operator](column, value)
+                return [ids[i] for i in np.flatnonzero(mask)]
+        operator_func = operator_map[operator]
+        return [item for item, item_val in zip(ids, values) if operator_func(item_val, value)]
 
     @classmethod
-    def matching_attributes(
-        cls, G: nx.Graph, attribute: str, type: Literal["node", "edge", "all"], **kwargs
-    ) -> list[str]:
-        """Return the all matching attribute names in the graph for a given input."""
+    def attribute_names(cls, G: AttributeGraph, type: Literal["node", "edge", "all"]) -> frozenset[str]:
+        """Return the set of attribute keys used on the nodes and/or edges of the graph."""
 
         match type:
             case "node":
-                all_attrs = {attr for _, attrs in G.nodes(data=True) for attr in attrs}
+                return frozenset(attr for _, attrs in G.nodes(data=True) for attr in attrs)
             case "edge":
-                all_attrs = {attr for _, _, attrs in G.edges(data=True) for attr in attrs}
+                return frozenset(attr for _, _, attrs in G.edges(data=True) for attr in attrs)
             case "all":
-                # Get all attribute keys from nodes and edges
-                node_attrs = {attr for _, attrs in G.nodes(data=True) for attr in attrs}
-                edge_attrs = {attr for _, _, attrs in G.edges(data=True) for attr in attrs}
-                all_attrs = node_attrs.union(edge_attrs)
+                return cls.attribute_names(G, "node") | cls.attribute_names(G, "edge")
+
+    @classmethod
+    def matching_attributes(
+        cls,
+        G: AttributeGraph,
+        attribute: str,
+        type: Literal["node", "edge", "all"],
+        names: Collection[str] | None = None,
+        limit: int | None = None,
+        **kwargs,
+    ) -> list[str]:
+        """Return the all matching attribute names in the graph for a given input.
 
-        matches = [attr for attr in all_attrs if attribute.lower() in attr.lower()]
-        return matches
+        Attribute names are ranked by their case-insensitive partial similarity to the
+        input, so every name containing the input scores 100 and comes first, followed by
+        near-matches (e.g. typos) scoring at least MATCH_SCORE_CUTOFF. Names shorter than
+        the input are scored by their whole-string similarity, so a name that merely
+        occurs in the input does not count as a match.
+
+        Parameters
+        ----------
+        G : AttributeGraph
+            Input graph, or an attribute view of one.
+        attribute : str
+            The search string to match against attribute keys.
+        type : Literal["node", "edge", "all"]
+            Whether to match node, edge or all attribute keys.
+        names : Collection[str] | None
+            Optional precomputed attribute keys of G for the given type. If None,
+            they are collected from the graph. A mapping is taken to map each key
+            to its lowercased form, so the keys are not lowercased on every call.
+        limit : int | None
+            Maximum number of names to return. If None, all matches are returned.
+
+        Returns
+        -------
+        list[str]
+            Matching attribute names, best match first.
+        """
+        if names is None:
+            names = cls.attribute_names(G, type)
+        if not attribute:
+            return list(islice(names, limit))
+        if not isinstance(names, Mapping):
+            names = {name: name.lower() for name in names}
+        query = attribute.lower()
+        # partial_ratio aligns the shorter string inside the longer one, so it only
+        # scores names at least as long as the query; a shorter name contained in the
+        # query (e.g. "x" in "max") would otherwise score 100. Shorter names are
+        # compared as a whole instead, which keeps substring hits the only 100s.
+        longer = {name: lowered for name, lowered in names.items() if len(lowered) >= len(query)}
+        shorter = {name: lowered for name, lowered in names.items() if len(lowered) < len(query)}
+        # With a mapping as choices, rapidfuzz scores the lowercased values and yields
+        # (lowercased, score, name) tuples.
+        scored = chain(
+            process.extract_iter(query, longer, scorer=fuzz.partial_ratio, score_cutoff=MATCH_SCORE_CUTOFF),
+            process.extract_iter(query, shorter, scorer=fuzz.ratio, score_cutoff=MATCH_SCORE_CUTOFF),
+        )
+        score = operator.itemgetter(1)
+        if limit == 1:
+            best = max(scored, key=score, default=None)
+            return [] if best is None else [best[2]]
+        if limit is not None:
+            matches = heapq.nlargest(limit, scored, key=score)
+        else:
+            matches = sorted(scored, key=score, reverse=True)
+        return [name for _, _, name in matches]
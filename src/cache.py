@@ -5,13 +5,174 @@ along with a helper function to resolve graphs from either direct
 data or cached URIs.
 """
 
+import hashlib
+import json
+import marshal
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Literal
+
 import networkx as nx
+import orjson
+from pydantic import TypeAdapter
 
-from src.base.base import Graph
+from src.base.attribute_index import AttributeIndex
+from src.base.base import Graph, GraphAttributeView
+from src.base.bfs import IndexedAdjacency
+from src.base.graph_analytics import NetworkXGraph
 from src.classes import GraphDataModel
 
+_graph_data_adapter = TypeAdapter(GraphDataModel)
+
+
+class _CachedGraph:
+    """Everything cached for one alias, built from a single load of its data.
+
+    Entries are published whole and never changed afterwards (apart from the JSON
+    serialization, filled on first read), so a reader that takes everything it needs
+    from one entry never mixes the graph of one load with the index of another.
+    """
+
+    __slots__ = ("data", "graph", "indices", "names", "adjacency", "json")
+
+    def __init__(
+        self,
+        data: dict,
+        graph: nx.Graph,
+        indices: dict[str, AttributeIndex],
+        names: dict[str, dict[str, str]],
+        adjacency: IndexedAdjacency,
+    ):
+        # The node-link data, as cached
+        self.data = data
+        # The graph built from the data
+        self.graph = graph
+        # Node and edge attribute indices, keyed by "node"/"edge"
+        self.indices = indices
+        # Node, edge and all attribute names, mapped to their lowercased form, keyed by "node"/"edge"/"all"
+        self.names = names
+        # Integer-indexed adjacency, for path searches
+        self.adjacency = adjacency
+        # JSON serialization of the data, filled on first read of the graph resource
+        self.json: str | None = None
+
+
 # Global cache for loaded graphs
-_loaded_graphs: dict[str, dict] = {}
+_loaded_graphs: dict[str, _CachedGraph] = {}
+
+# Serializes writers of the cache. Readers take no lock, since each alias is replaced by
+# a single assignment of its whole entry.
+_cache_lock = threading.Lock()
+
+
+class _GraphDataKey:
+    """Hashable wrapper around inline graph data, keyed by a digest of its content.
+
+    The memoized builders take the data out of the key (see take_data), so the keys
+    kept by their caches only hold the digest, not the caller's payload.
+    """
+
+    __slots__ = ("digest", "graph_data")
+
+    def __init__(self, graph_data: dict):
+        self.graph_data: dict | None = graph_data
+        # marshal format 2 predates back-references, so the bytes depend only on the content,
+        # not on which equal strings happen to be shared, and it is several times faster than
+        # json.dumps. Unlike orjson it keeps NaN and None apart. Equal dicts with a different
+        # key order get different digests, which only costs a rebuild.
+        self.digest = hashlib.blake2b(marshal.dumps(graph_data, 2)).digest()
+
+    def take_data(self) -> dict:
+        """Return the graph data and drop the key's reference to it."""
+        graph_data, self.graph_data = self.graph_data, None
+        if graph_data is None:
+            raise RuntimeError("The graph data of this key was already taken")
+        return graph_data
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _GraphDataKey) and self.digest == other.digest
+
+
+def _intern_strings(graph_model: GraphDataModel) -> GraphDataModel:
+    """Intern the string attribute values of all nodes and links in place.
+
+    Categorical values shared by many nodes or edges (e.g. 'object_type') then
+    refer to a single string object, which saves memory and lets equality
+    comparisons short-circuit on identity. This includes the 'id', 'source' and
+    'target' values, so every edge end refers to the same string object as its
+    node, and adjacency lookups compare node ids by identity.
+    """
+    intern = sys.intern
+    for items in (graph_model.nodes, graph_model.links):
+        for attrs in items:
+            for attr, val in attrs.items():
+                if type(val) is str:
+                    attrs[attr] = intern(val)
+    return graph_model
+
+
+def _graph_model(graph_data: dict) -> GraphDataModel:
+    """Return the validated node-link model of graph data, with its string values interned."""
+    return _intern_strings(_graph_data_adapter.validate_python(graph_data))
+
+
+def _node_link_data(graph_model: GraphDataModel) -> dict:
+    """Return the node-link data of a model as a dict, with edges under 'links'.
+
+    Equal to model_dump(), but the node and link lists of the model are shared
+    instead of deep-copied, which saves a pass over every node and edge.
+    """
+    return {
+        "directed": graph_model.directed,
+        "multigraph": graph_model.multigraph,
+        "graph": graph_model.graph,
+        "nodes": graph_model.nodes,
+        "links": graph_model.links,
+    }
+
+
+def _build_graph(graph_data: dict) -> nx.Graph:
+    """Build the NetworkX graph for node-link data."""
+    return Graph(_graph_model(graph_data)).graph
+
+
+@lru_cache(maxsize=32)
+def _build_inline_graph(key: _GraphDataKey) -> nx.Graph:
+    """Build a graph from inline data, memoized on the content digest."""
+    return _build_graph(key.take_data())
+
+
+@lru_cache(maxsize=32)
+def _build_inline_view(key: _GraphDataKey) -> GraphAttributeView:
+    """Build an attribute view of inline data, memoized on the content digest."""
+    return GraphAttributeView(_graph_model(key.take_data()))
+
+
+def _parse_graph_uri(graph_uri: str) -> str:
+    """Return the alias of a 'graph://<alias>' URI, raising ValueError if malformed."""
+    alias = graph_uri.removeprefix("graph://")
+    if alias == graph_uri:
+        raise ValueError(f"Invalid graph URI '{graph_uri}'. Expected 'graph://<alias>'.")
+    return alias
+
+
+def _resolve_cached_graph(graph_uri: str) -> _CachedGraph:
+    """Return the cache entry of a 'graph://<alias>' URI.
+
+    Raises
+    ------
+    ValueError
+        If the URI is malformed or the alias is not cached.
+    """
+    alias = _parse_graph_uri(graph_uri)
+    cached = _loaded_graphs.get(alias)
+    if cached is None:
+        raise ValueError(f"Graph '{alias}' not found. Load it first with load_graph_from_file.")
+    return cached
 
 
 def _resolve_graph(graph_data: dict | None, graph_uri: str | None) -> nx.Graph:
@@ -22,30 +183,193 @@ def _resolve_graph(graph_data: dict | None, graph_uri: str | None) -> nx.Graph:
     graph_data : dict | None
         Direct node-link graph data.
     graph_uri : str | None
-        URI of a cached graph (e.g., 'graph://default').
+        URI of a cached graph (e.g., 'graph://default'). Takes precedence over
+        graph_data when both are given, so the cached graph is never rebuilt.
 
     Returns
     -------
     networkx.Graph
-        The resolved graph instance.
+        The resolved graph instance. Graphs are memoized and shared between
+        calls, so callers must not mutate them.
 
     Raises
     ------
     ValueError
-        If neither or both parameters are provided, or if the URI is not found.
+        If neither parameter is provided, or if the URI is not found.
     """
     if graph_uri:
-        if not graph_uri.startswith("graph://"):
-            raise ValueError(f"Invalid graph URI '{graph_uri}'. Expected 'graph://<alias>'.")
-        alias = graph_uri.replace("graph://", "")
-        if alias not in _loaded_graphs:
-            raise ValueError(f"Graph '{alias}' not found. Load it first with load_graph_from_file.")
-        return Graph(GraphDataModel.model_validate(_loaded_graphs[alias])).graph
+        return _resolve_cached_graph(graph_uri).graph
 
     # At this point, graph_data must be a dict (we validated above)
     if not isinstance(graph_data, dict):
         raise ValueError("No graph data provided. Please provide either graph_data or graph_uri.")
-    return Graph(GraphDataModel.model_validate(graph_data)).graph
+    return _build_inline_graph(_GraphDataKey(graph_data))
+
+
+def _resolve_attribute_view(graph_data: dict | None, graph_uri: str | None) -> nx.Graph | GraphAttributeView:
+    """Resolve the node and edge attributes of a graph for attribute-only queries.
+
+    Cached graphs are returned as is, since they are already built. Direct data is
+    turned into a GraphAttributeView instead of a full NetworkX graph, which skips
+    building adjacency that attribute filters never traverse.
+
+    Parameters
+    ----------
+    graph_data : dict | None
+        Direct node-link graph data.
+    graph_uri : str | None
+        URI of a cached graph (e.g., 'graph://default'). Takes precedence over graph_data.
+
+    Returns
+    -------
+    networkx.Graph | GraphAttributeView
+        The cached graph or the attribute view. Both are shared between calls, so
+        callers must not mutate them.
+
+    Raises
+    ------
+    ValueError
+        If neither parameter is provided, or if the URI is not found.
+    """
+    if graph_uri:
+        return _resolve_graph(None, graph_uri)
+    if not isinstance(graph_data, dict):
+        raise ValueError("No graph data provided. Please provide either graph_data or graph_uri.")
+    return _build_inline_view(_GraphDataKey(graph_data))
+
+
+def _resolve_attribute_query(
+    graph_data: dict | None, graph_uri: str | None, kind: Literal["node", "edge"]
+) -> tuple[nx.Graph | GraphAttributeView, AttributeIndex | None]:
+    """Resolve a graph for attribute-only queries, together with its node or edge attribute index.
+
+    Parameters
+    ----------
+    graph_data : dict | None
+        Direct node-link graph data.
+    graph_uri : str | None
+        URI of a cached graph (e.g., 'graph://default'). Takes precedence over graph_data.
+    kind : Literal["node", "edge"]
+        Whether to return the node or the edge attribute index.
+
+    Returns
+    -------
+    tuple[networkx.Graph | GraphAttributeView, AttributeIndex | None]
+        The graph or attribute view, as returned by _resolve_attribute_view, and the
+        index of the same cached graph, or None for direct graph data.
+
+    Raises
+    ------
+    ValueError
+        If neither parameter is provided, or if the URI is not found.
+    """
+    if graph_uri:
+        cached = _resolve_cached_graph(graph_uri)
+        return cached.graph, cached.indices[kind]
+    return _resolve_attribute_view(graph_data, None), None
+
+
+def _build_attribute_indices(G: nx.Graph) -> dict[str, AttributeIndex]:
+    """Build the node and edge attribute indices of a graph."""
+    return {
+        "node": AttributeIndex(G.nodes(data=True)),
+        "edge": AttributeIndex(NetworkXGraph.edge_items(G)),
+    }
+
+
+def _build_attribute_names(G: nx.Graph) -> dict[str, dict[str, str]]:
+    """Collect the node and edge attribute names of a graph, and their union, with their lowercased form."""
+    node_names = NetworkXGraph.attribute_names(G, "node")
+    edge_names = NetworkXGraph.attribute_names(G, "edge")
+    return {
+        type: {name: name.lower() for name in names}
+        for type, names in (("node", node_names), ("edge", edge_names), ("all", node_names | edge_names))
+    }
+
+
+def _resolve_path_graph(graph_data: dict | None, graph_uri: str | None) -> tuple[nx.Graph, IndexedAdjacency | None]:
+    """Resolve a graph for path searches, together with its integer-indexed adjacency.
+
+    Parameters
+    ----------
+    graph_data : dict | None
+        Direct node-link graph data.
+    graph_uri : str | None
+        URI of a cached graph (e.g., 'graph://default'). Takes precedence over graph_data.
+
+    Returns
+    -------
+    tuple[networkx.Graph, IndexedAdjacency | None]
+        The graph, as returned by _resolve_graph, and the adjacency of the same cached
+        graph, or None for direct graph data.
+
+    Raises
+    ------
+    ValueError
+        If neither parameter is provided, or if the URI is not found.
+    """
+    if graph_uri:
+        cached = _resolve_cached_graph(graph_uri)
+        return cached.graph, cached.adjacency
+    return _resolve_graph(graph_data, None), None
+
+
+@lru_cache(maxsize=2048)
+def _best_match_cached(
+    cached: _CachedGraph, attribute: str, type: Literal["node", "edge", "all"], top_k: int | None
+) -> tuple[str, ...]:
+    """Match attribute names of a cached graph, memoized until the next cache_graph call.
+
+    The cache entry is part of the key, so a match computed while the alias is being
+    cached again is never returned for the new graph.
+    """
+    return tuple(
+        NetworkXGraph.matching_attributes(cached.graph, attribute, type=type, names=cached.names[type], limit=top_k)
+    )
+
+
+def _resolve_best_matches(
+    graph_data: dict | None,
+    graph_uri: str | None,
+    attribute: str,
+    type: Literal["node", "edge", "all"],
+    top_k: int | None = None,
+) -> list[str]:
+    """Return the attribute names of a graph that best match the search string.
+
+    Results for cached graphs are memoized on (cache entry, attribute, type, top_k), so
+    repeated queries against the same 'graph://<alias>' skip the fuzzy scoring until
+    the alias is cached again.
+    Direct graph data has no stable key and is matched on every call.
+
+    Parameters
+    ----------
+    graph_data : dict | None
+        Direct node-link graph data.
+    graph_uri : str | None
+        URI of a cached graph (e.g., 'graph://default'). Takes precedence over graph_data.
+    attribute : str
+        The search string to match against attribute names.
+    type : Literal["node", "edge", "all"]
+        Which attribute names to match.
+    top_k : int | None, optional
+        Maximum number of best matches to return (default: all matches).
+
+    Returns
+    -------
+    list[str]
+        The matching attribute names, best match first.
+
+    Raises
+    ------
+    ValueError
+        If neither graph parameter is provided, or if the URI is not found.
+    """
+    if graph_uri:
+        return list(_best_match_cached(_resolve_cached_graph(graph_uri), attribute, type, top_k))
+
+    G = _resolve_attribute_view(graph_data, None)
+    return NetworkXGraph.matching_attributes(G, attribute, type=type, limit=top_k)
 
 
 def get_cached_graph(alias: str) -> dict | None:
@@ -61,20 +385,109 @@ def get_cached_graph(alias: str) -> dict | None:
     dict | None
         The cached node-link graph data, or None if not found.
     """
-    return _loaded_graphs.get(alias)
+    cached = _loaded_graphs.get(alias)
+    return None if cached is None else cached.data
+
+
+def _orjson_exact(data: Any) -> bool:
+    """Return whether orjson encodes the JSON-compatible data without changing it.
+
+    orjson writes NaN and infinities as null and rejects integers outside the range
+    [-2**63, 2**64), which the standard json module encodes as given.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is dict:
+            stack.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            stack.extend(value)
+        elif value_type is float:
+            if value - value != 0:  # NaN or infinite
+                return False
+        elif value_type is int and not -(2**63) <= value < 2**64:
+            return False
+    return True
+
 
+def _orjson_rounded(data: Any) -> bool:
+    """Return whether data parsed by orjson may hold integers it rounded to floats.
 
-def cache_graph(alias: str, graph_data: dict) -> None:
+    orjson parses integers outside the range [-2**63, 2**64) as floats, so parsed
+    floats of at least that magnitude may have been such integers in the JSON text.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is dict:
+            stack.extend(value.values())
+        elif value_type is list:
+            stack.extend(value)
+        elif value_type is float and (value >= 2**64 or value <= -(2**63)):
+            return True
+    return False
+
+
+def get_cached_graph_json(alias: str) -> str | None:
+    """Get a cached graph by alias, serialized as JSON.
+
+    The data is serialized (and decoded to text) on first access and kept until the
+    alias is cached again, so repeated reads of the same graph resource are a
+    dictionary lookup without any copying. Data that orjson cannot encode exactly
+    (non-finite floats, integers beyond 64 bits) is serialized with json instead.
+
+    Parameters
+    ----------
+    alias : str
+        The graph cache key.
+
+    Returns
+    -------
+    str | None
+        The JSON-encoded node-link graph data, or None if not found.
+    """
+    cached = _loaded_graphs.get(alias)
+    if cached is None:
+        return None
+    serialized = cached.json
+    if serialized is None:
+        # Kept on the entry it was serialized from, so it never outlives its data. Readers
+        # racing here serialize the same data and store equal strings.
+        if _orjson_exact(cached.data):
+            serialized = orjson.dumps(cached.data, option=orjson.OPT_NON_STR_KEYS).decode()
+        else:
+            serialized = json.dumps(cached.data)
+        cached.json = serialized
+    return serialized
+
+
+def cache_graph(alias: str, graph_data: dict, graph: nx.Graph | None = None) -> None:
     """Cache a graph under the given alias.
 
+    The graph object, its attribute indices and names and its integer-indexed
+    adjacency are built once here so that subsequent resolves of 'graph://<alias>'
+    are a plain dictionary lookup.
+    Memoized attribute matches are dropped, as they may refer to the replaced graph.
+    Everything is built before taking the cache lock, which is only held to publish
+    the entry, so concurrent reads are never blocked by a load.
+
     Parameters
     ----------
     alias : str
         The cache key.
     graph_data : dict
         Node-link graph data to cache.
+    graph : networkx.Graph | None, optional
+        The graph already built from graph_data, if the caller has one. It is
+        cached as is instead of being built again.
     """
-    _loaded_graphs[alias] = graph_data
+    G = graph if graph is not None else _build_graph(graph_data)
+    cached = _CachedGraph(graph_data, G, _build_attribute_indices(G), _build_attribute_names(G), IndexedAdjacency(G))
+    with _cache_lock:
+        _loaded_graphs[alias] = cached
+        _best_match_cached.cache_clear()
 
 
 def is_cached(alias: str) -> bool:
@@ -91,3 +504,12 @@ def is_cached(alias: str) -> bool:
         True if the graph is cached, False otherwise.
     """
     return alias in _loaded_graphs
+
+
+def clear_cache() -> None:
+    """Remove all cached graphs, together with everything derived from them."""
+    with _cache_lock:
+        _loaded_graphs.clear()
+        _best_match_cached.cache_clear()
+        _build_inline_graph.cache_clear()
+        _build_inline_view.cache_clear()
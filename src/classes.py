@@ -57,6 +57,8 @@ class AttributeValueFilter(AttributeBaseModel):
 class AttributeMatchRequest(AttributeBaseModel):
     """Request model for attribute matching."""
 
+    top_k: Annotated[int | None, Field(description="Maximum number of best matches to return", ge=1)] = None
+
 
 class ResultsModel(BaseModel):
     matches: Annotated[list, Field(description="List of matching node IDs or edge tuples")]
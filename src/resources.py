@@ -1,10 +1,9 @@
 """MCP resource definitions for the NetworkX server."""
 
-import json
-
+import orjson
 from fastmcp import FastMCP
 
-from src.cache import get_cached_graph
+from src.cache import get_cached_graph_json
 
 
 def get_graph_resource(alias: str) -> str:
@@ -23,10 +22,12 @@ def get_graph_resource(alias: str) -> str:
     str
         JSON representation of the cached node-link graph data.
     """
-    graph_data = get_cached_graph(alias)
-    if graph_data is None:
-        return json.dumps({"error": f"Graph '{alias}' not found. Use load_graph_from_file to load it first."})
-    return json.dumps(graph_data)
+    graph_json = get_cached_graph_json(alias)
+    if graph_json is None:
+        return orjson.dumps(
+            {"error": f"Graph '{alias}' not found. Use load_graph_from_file to load it first."}
+        ).decode()
+    return graph_json
 
 
 def register_resources(mcp: FastMCP) -> None:
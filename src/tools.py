@@ -7,27 +7,93 @@ graph analytics functionality via the Model Context Protocol.
 from __future__ import annotations
 
 import json
+import os
+import stat
 from pathlib import Path
-from typing import Literal
+from typing import Annotated, Literal
 
 import networkx as nx
+import orjson
 from fastmcp import FastMCP
+from pydantic import Field
 
 from src.base.base import Graph
 from src.base.graph_analytics import NetworkXGraph
-from src.cache import _resolve_graph, cache_graph
+from src.cache import (
+    _graph_model,
+    _node_link_data,
+    _orjson_rounded,
+    _resolve_attribute_query,
+    _resolve_best_matches,
+    _resolve_path_graph,
+    cache_graph,
+)
 from src.classes import (
     AttributeMatchRequest,
-    AttributeValueFilter,
     ErrorModel,
     GraphCacheModel,
-    GraphDataModel,
     GraphPathModel,
     ResultsAttributesModel,
     ResultsModel,
 )
 
 
+def _load_graph(path: str, alias: str) -> GraphCacheModel | ErrorModel:
+    """Load a graph from a JSON file and cache it under the given alias.
+
+    Parameters
+    ----------
+    path : str
+        The file path of the graph JSON file.
+    alias : str
+        The alias under which to cache the graph.
+
+    Returns
+    -------
+    GraphCacheModel | ErrorModel
+        Status information and the resource URI, or an error.
+    """
+    try:
+        request = GraphPathModel(path=path, alias=alias)
+        # One stat instead of exists() and is_file(). Anything but a regular file is rejected
+        # before reading, as FIFOs block and devices like /dev/zero never end.
+        try:
+            if not stat.S_ISREG(os.stat(request.path).st_mode):
+                return ErrorModel(error=f"Path is not a file: {request.path}")
+            raw = Path(request.path).read_bytes()
+        except (FileNotFoundError, NotADirectoryError):
+            # NotADirectoryError: a parent in the path is a file, so the file cannot exist
+            return ErrorModel(error=f"File not found: {request.path}")
+        except PermissionError:
+            return ErrorModel(error=f"Permission denied: {request.path}")
+
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals that json.dump writes for non-finite floats
+            data = json.loads(raw)
+        else:
+            if _orjson_rounded(data):
+                # json keeps the integers beyond 64 bits that orjson parses as floats
+                data = json.loads(raw)
+        graph_data = _graph_model(data)
+        # Validate by creating a graph (will raise if invalid)
+        G = Graph(graph_data).graph
+
+        # Cache the raw data together with the graph, so it is not built again
+        cache_graph(request.alias, _node_link_data(graph_data), graph=G)
+
+        return GraphCacheModel(
+            alias=request.alias,
+            status="loaded",
+            uri=f"graph://{request.alias}",
+        )
+    except json.JSONDecodeError as e:
+        return ErrorModel(error=f"Invalid JSON: {e}")
+    except Exception as e:
+        return ErrorModel(error=f"Failed to load graph: {e}")
+
+
 def register_tools(mcp: FastMCP) -> None:
     """Register all MCP tools with the server.
 
@@ -63,31 +129,56 @@ def register_tools(mcp: FastMCP) -> None:
         GraphCacheModel
             Status information and the resource URI.
         """
-        try:
-            request = GraphPathModel(path=path, alias=alias)
-            file_path = Path(request.path)
-            if not file_path.exists():
-                return ErrorModel(error=f"File not found: {request.path}")
-            if not file_path.is_file():
-                return ErrorModel(error=f"Path is not a file: {request.path}")
+        return _load_graph(path, alias)
 
-            with open(file_path, encoding="utf-8") as f:
-                graph_data = GraphDataModel.model_validate(json.load(f))
-            # Validate by creating a graph (will raise if invalid)
-            _ = Graph(graph_data).graph
+    @mcp.tool(
+        name="load_and_match",
+        description=(
+            "Load a graph from a JSON file, cache it under an alias and discover attribute names that "
+            "*partially* match a search string, all in a single call. "
+            "Inputs: path (file path), attribute (search string), alias (cache key, default 'default'), "
+            "type (one of 'node', 'edge', 'all'; default 'node'), top_k (optional max number of results). "
+            "Output: {matching_attributes: [attribute_name, ...]}; the graph stays available as 'graph://<alias>'. "
+            "Side effects: loads file from disk, caches graph in server memory."
+        ),
+    )
+    def load_and_match(
+        path: str,
+        attribute: str,
+        alias: str = "default",
+        type: Literal["node", "edge", "all"] = "node",
+        top_k: Annotated[int | None, Field(ge=1)] = None,
+    ) -> ResultsAttributesModel | ErrorModel:
+        """Load and cache a graph, then return its attribute keys matching the search string.
 
-            # Cache the raw data
-            cache_graph(request.alias, graph_data.model_dump())
+        This combines load_graph_from_file and find_best_matching_*_attribute so that
+        the common "load, then discover attributes" flow costs one round trip.
 
-            return GraphCacheModel(
-                alias=request.alias,
-                status="loaded",
-                uri=f"graph://{request.alias}",
-            )
-        except json.JSONDecodeError as e:
-            return ErrorModel(error=f"Invalid JSON: {e}")
-        except Exception as e:
-            return ErrorModel(error=f"Failed to load graph: {e}")
+        Parameters
+        ----------
+        path : str
+            The file path of the graph JSON file.
+        attribute : str
+            The search string to match against attribute keys.
+        alias : str, optional
+            The alias under which to cache the graph (default is "default").
+        type : Literal["node", "edge", "all"], optional
+            Whether to match node, edge or all attribute keys (default is "node").
+        top_k : int | None, optional
+            Maximum number of best matches to return, at least 1 (default: all matches).
+
+        Returns
+        -------
+        ResultsAttributesModel
+            List of matching attribute names.
+        """
+        loaded = _load_graph(path, alias)
+        if isinstance(loaded, ErrorModel):
+            return loaded
+
+        matching_attributes = _resolve_best_matches(None, loaded.uri, attribute, type, top_k)
+
+        return ResultsAttributesModel(matching_attributes=matching_attributes)
 
     @mcp.tool(
         name="health",
@@ -120,14 +211,15 @@ def register_tools(mcp: FastMCP) -> None:
 
         Notes
         -----
-        - This uses NetworkX's default shortest path for unweighted graphs.
+        - This uses a bidirectional breadth-first search, as for unweighted graphs
+          the path is found where the searches from source and target meet.
         - For directed graphs, the path respects edge direction.
         - The input graph must be in NetworkX node-link format (as produced by `networkx.node_link_data`).
           This project accepts both 'links' and 'edges' as the edge list key.
         """
         try:
-            G = _resolve_graph(graph_data, graph_uri)
-            path = nx.shortest_path(G, source=source, target=target)
+            G, adjacency = _resolve_path_graph(graph_data, graph_uri)
+            path = NetworkXGraph.shortest_path(G, source, target, adjacency=adjacency)
             return {"path": path}
         except nx.NetworkXNoPath:
             return {"error": f"No path found between {source} and {target}."}
@@ -175,15 +267,9 @@ def register_tools(mcp: FastMCP) -> None:
 
         """
         try:
-            request = AttributeValueFilter(
-                uri=uri,
-                attribute=attribute,
-                value=value,
-                operator=operator,
-                graph_data=graph_data,
-            )
-            G = _resolve_graph(request.graph_data, request.uri)
-            matching_nodes = NetworkXGraph.nodes_by_attribute(G, request.attribute, request.value, request.operator)
+            # Arguments are already validated against the signature by FastMCP
+            G, index = _resolve_attribute_query(graph_data, uri, "node")
+            matching_nodes = NetworkXGraph.nodes_by_attribute(G, attribute, value, operator, index=index)
             return ResultsModel(matches=matching_nodes)
         except (KeyError, TypeError, ValueError) as e:
             return ErrorModel(error=f"Invalid input: {e}")
@@ -228,15 +314,9 @@ def register_tools(mcp: FastMCP) -> None:
 
         """
         try:
-            request = AttributeValueFilter(
-                uri=uri,
-                attribute=attribute,
-                value=value,
-                operator=operator,
-                graph_data=graph_data,
-            )
-            G = _resolve_graph(request.graph_data, request.uri)
-            matching_edges = NetworkXGraph.edges_by_attribute(G, request.attribute, request.value, request.operator)
+            # Arguments are already validated against the signature by FastMCP
+            G, index = _resolve_attribute_query(graph_data, uri, "edge")
+            matching_edges = NetworkXGraph.edges_by_attribute(G, attribute, value, operator, index=index)
             return ResultsModel(matches=matching_edges)
         except (KeyError, TypeError, ValueError) as e:
             return ErrorModel(error=f"Invalid input: {e}")
@@ -245,12 +325,16 @@ def register_tools(mcp: FastMCP) -> None:
         name="find_best_matching_node_attribute",
         description=(
             "Discover node attribute names present in the graph that *partially* match a search string. "
-            "Behavior: collects all node attribute keys where search_string is a case-insensitive substring of the key. "
-            "Output: {matching_attributes: [attribute_name, ...]} (unique list). Side effects: none."
+            "Behavior: collects all node attribute keys where search_string is a case-insensitive substring of the key, "
+            "plus close fuzzy matches (e.g. typos). Optional top_k limits the number of results. "
+            "Output: {matching_attributes: [attribute_name, ...]} (unique list, best match first). Side effects: none."
         ),
     )
     def find_best_matching_node_attribute(
-        uri: str, attribute: str, graph_data: dict | None = None
+        uri: str,
+        attribute: str,
+        graph_data: dict | None = None,
+        top_k: Annotated[int | None, Field(ge=1)] = None,
     ) -> ResultsAttributesModel | ErrorModel:
         """Return a list of node attribute keys which at least partially matches the provided attribute.
         E.g. if attribute="age", it would match "age", "age_years", "average_age", etc.
@@ -263,29 +347,32 @@ def register_tools(mcp: FastMCP) -> None:
             The search string to match against attribute keys.
         graph_data : dict | None, optional
             The graph data in node-link format (if not using a cached URI).
+        top_k : int | None, optional
+            Maximum number of best matches to return, at least 1 (default: all matches).
 
         Returns
         -------
         ResultsAttributesModel
             List of matching attribute names.
         """
-        request = AttributeMatchRequest(uri=uri, attribute=attribute, graph_data=graph_data)
+        request = AttributeMatchRequest(uri=uri, attribute=attribute, graph_data=graph_data, top_k=top_k)
         try:
-            G = _resolve_graph(request.graph_data, request.uri)
+            matching_attributes = _resolve_best_matches(
+                request.graph_data, request.uri, request.attribute, "node", request.top_k
+            )
         except ValueError as e:
             return ErrorModel(error=str(e))
 
-        matching_attributes = NetworkXGraph.matching_attributes(G, request.attribute, type="node")
-
-        return ResultsAttributesModel(matching_attributes=list(set(matching_attributes)))
+        return ResultsAttributesModel(matching_attributes=matching_attributes)
 
     @mcp.tool(
         name="find_best_matching_edge_attribute",
         description=(
             "Discover edge attribute names present in the graph that *partially* match a search string. "
-            "Inputs: {request: {'uri': <uri>, 'attribute': <attribute>}}. "
-            "Behavior: collects all edge attribute keys where search_string is a case-insensitive substring of the key. "
-            "Output: {matching_attributes: [attribute_name, ...]} (unique list). Side effects: none."
+            "Inputs: {request: {'uri': <uri>, 'attribute': <attribute>, 'top_k': <optional max results>}}. "
+            "Behavior: collects all edge attribute keys where search_string is a case-insensitive substring of the key, "
+            "plus close fuzzy matches (e.g. typos). Optional top_k limits the number of results. "
+            "Output: {matching_attributes: [attribute_name, ...]} (unique list, best match first). Side effects: none."
         ),
     )
     def find_best_matching_edge_attribute(
@@ -303,6 +390,8 @@ def register_tools(mcp: FastMCP) -> None:
             The search string to match against attribute keys.
         graph_data : dict | None, optional
             The graph data in node-link format (if not using a cached URI).
+        top_k : int | None, optional
+            Maximum number of best matches to return (default: all matches).
 
 
         Returns
@@ -312,10 +401,10 @@ def register_tools(mcp: FastMCP) -> None:
 
         """
         try:
-            G = _resolve_graph(request.graph_data, request.uri)
+            matching_attributes = _resolve_best_matches(
+                request.graph_data, request.uri, request.attribute, "edge", request.top_k
+            )
         except ValueError as e:
             return ErrorModel(error=str(e))
 
-        matching_attributes = NetworkXGraph.matching_attributes(G, request.attribute, type="edge")
-
-        return ResultsAttributesModel(matching_attributes=list(set(matching_attributes)))
+        return ResultsAttributesModel(matching_attributes=matching_attributes)
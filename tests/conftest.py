@@ -0,0 +1,42 @@
+"""Shared fixtures for the test suite.
+
+The graph files are parsed (and the sample graphs built) once per session; tests
+only read them, and the per-module autouse fixtures clear the graph cache, not
+these objects.
+"""
+
+import pathlib
+
+import orjson
+import pytest
+
+from src.base.base import Graph
+from src.classes import GraphDataModel
+
+DATA_DIR = pathlib.Path(__file__).parents[1] / "data"
+
+
+@pytest.fixture(scope="session")
+def sample_graph_data():
+    """Load sample graph data from JSON file."""
+    return orjson.loads((DATA_DIR / "sample_graph_attr.json").read_bytes())
+
+
+@pytest.fixture(scope="session")
+def example_graph_data():
+    """Load example graph data from JSON file."""
+    return orjson.loads((DATA_DIR / "example_graph.json").read_bytes())
+
+
+@pytest.fixture(scope="session")
+def sample_graph(sample_graph_data):
+    """Create a NetworkX graph from sample data."""
+    graph_model = GraphDataModel.model_validate(sample_graph_data)
+    return Graph(graph_model).graph
+
+
+@pytest.fixture(scope="session")
+def example_graph(example_graph_data):
+    """Create a NetworkX graph from example data."""
+    graph_model = GraphDataModel.model_validate(example_graph_data)
+    return Graph(graph_model).graph
@@ -1,23 +1,76 @@
-import json
-import pathlib
-
 import networkx as nx
 import pytest
 
-from src.base.base import Graph
+from src.base.base import Graph, GraphAttributeView
 from src.classes import GraphDataModel
 
 
-@pytest.fixture
-def sample_graph():
-    with open(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json") as f:
-        graph_data = json.load(f)
-    return graph_data
-
-
-def test_create_graph(sample_graph):
+def test_create_graph(sample_graph_data):
     """Load a sample graph and test creation of NetworkX graph."""
-    graph_data = GraphDataModel.model_validate(sample_graph)
+    graph_data = GraphDataModel.model_validate(sample_graph_data)
     G = Graph(graph_data).graph
     assert isinstance(G, nx.Graph)
     # assert G.number_of_nodes() == 4
+
+
+@pytest.mark.parametrize("multigraph", [True, False])
+@pytest.mark.parametrize("directed", [True, False])
+def test_create_graph_matches_node_link_graph(sample_graph_data, multigraph, directed):
+    """The directly built graph is identical to the one built by nx.node_link_graph."""
+    data = {**sample_graph_data, "graph": {}, "multigraph": multigraph, "directed": directed}
+    G = Graph(GraphDataModel.model_validate(data)).graph
+    expected = nx.node_link_graph(data, edges="links")
+
+    assert type(G) is type(expected)
+    assert list(G.nodes(data=True)) == list(expected.nodes(data=True))
+    if multigraph:
+        assert isinstance(G, nx.MultiGraph) and isinstance(expected, nx.MultiGraph)
+        assert list(G.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+    else:
+        assert list(G.edges(data=True)) == list(expected.edges(data=True))
+
+
+@pytest.mark.parametrize("multigraph", [True, False])
+@pytest.mark.parametrize("directed", [True, False])
+def test_attribute_view_matches_graph(multigraph, directed):
+    """The attribute view reports the same nodes and edges, in order, as the built graph."""
+    data = {
+        "multigraph": multigraph,
+        "directed": directed,
+        "nodes": [{"id": "b", "w": 1}, {"id": "a"}, {"id": "b", "v": 2}],
+        "links": [
+            {"source": "b", "target": "a", "w": 1},
+            {"source": "a", "target": "b", "w": 2},
+            {"source": "c", "target": "c"},
+            {"source": "a", "target": "b", "key": 0, "v": 3},
+        ],
+    }
+    graph_model = GraphDataModel.model_validate(data)
+    G = Graph(graph_model).graph
+    view = GraphAttributeView(graph_model)
+
+    assert view.is_multigraph() == G.is_multigraph()
+    assert view.nodes(data=True) == list(G.nodes(data=True))
+    assert view.edges(data=True) == list(G.edges(data=True))
+    if multigraph:
+        assert isinstance(G, nx.MultiGraph)
+        assert view.edges(keys=True, data=True) == list(G.edges(keys=True, data=True))
+
+
+@pytest.mark.parametrize("multigraph", [True, False])
+@pytest.mark.parametrize(
+    "nodes, links",
+    [
+        ([{"id": None}], []),
+        ([{"id": "a"}], [{"source": None, "target": "a"}]),
+        ([{"id": "a"}], [{"source": "a", "target": None}]),
+    ],
+)
+def test_attribute_view_rejects_none_nodes(multigraph, nodes, links):
+    """The attribute view rejects None node ids with the same error as building the graph."""
+    graph_model = GraphDataModel.model_validate({"multigraph": multigraph, "nodes": nodes, "links": links})
+
+    with pytest.raises(ValueError, match="None cannot be a node"):
+        Graph(graph_model)
+    with pytest.raises(ValueError, match="None cannot be a node"):
+        GraphAttributeView(graph_model)
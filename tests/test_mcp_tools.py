@@ -4,52 +4,48 @@ This module tests the underlying functionality of the MCP tools including
 graph creation, caching, shortest path, attribute filtering, and more.
 """
 
+import asyncio
 import json
+import os
 import pathlib
+import subprocess
+import sys
 
 import networkx as nx
+import numpy as np
 import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
 
+from src import cache as cache_module
+from src.base.attribute_index import AttributeIndex, np_operator_map
 from src.base.base import Graph
-from src.base.graph_analytics import NetworkXGraph
-from src.cache import _loaded_graphs, _resolve_graph, cache_graph, get_cached_graph
-from src.classes import GraphDataModel
-
-
-@pytest.fixture
-def sample_graph_data():
-    """Load sample graph data from JSON file."""
-    with open(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json") as f:
-        return json.load(f)
-
-
-@pytest.fixture
-def example_graph_data():
-    """Load example graph data from JSON file."""
-    with open(pathlib.Path(__file__).parents[1] / "data/example_graph.json") as f:
-        return json.load(f)
-
-
-@pytest.fixture
-def sample_graph(sample_graph_data):
-    """Create a NetworkX graph from sample data."""
-    graph_model = GraphDataModel.model_validate(sample_graph_data)
-    return Graph(graph_model).graph
-
-
-@pytest.fixture
-def example_graph(example_graph_data):
-    """Create a NetworkX graph from example data."""
-    graph_model = GraphDataModel.model_validate(example_graph_data)
-    return Graph(graph_model).graph
+from src.base.bfs import IndexedAdjacency, bfs_path
+from src.base.graph_analytics import NetworkXGraph, operator_map
+from src.cache import (
+    _build_inline_graph,
+    _build_inline_view,
+    _GraphDataKey,
+    _loaded_graphs,
+    _resolve_attribute_query,
+    _resolve_best_matches,
+    _resolve_graph,
+    _resolve_path_graph,
+    cache_graph,
+    clear_cache,
+    get_cached_graph,
+    get_cached_graph_json,
+)
+from src.classes import ErrorModel, GraphCacheModel, GraphDataModel
+from src.tools import _load_graph, register_tools
 
 
 @pytest.fixture(autouse=True)
 def clear_graph_cache():
     """Clear the graph cache before and after each test."""
-    _loaded_graphs.clear()
+    clear_cache()
     yield
-    _loaded_graphs.clear()
+    clear_cache()
 
 
 class TestGraphCreation:
@@ -108,17 +104,305 @@ class TestGraphCache:
         assert isinstance(G, nx.Graph)
         assert G.number_of_nodes() > 0
 
+    def test_resolve_graph_from_uri_is_cached(self, sample_graph_data):
+        """Test that resolving the same URI twice does not rebuild the graph."""
+        cache_graph("test", sample_graph_data)
+
+        g1 = _resolve_graph(graph_data=None, graph_uri="graph://test")
+        g2 = _resolve_graph(graph_data=None, graph_uri="graph://test")
+
+        assert g1 is g2
+
+    def test_resolve_graph_from_uri_after_recache(self, sample_graph_data, example_graph_data):
+        """Test that caching under an existing alias replaces the resolved graph."""
+        cache_graph("test", sample_graph_data)
+        g1 = _resolve_graph(graph_data=None, graph_uri="graph://test")
+
+        cache_graph("test", example_graph_data)
+        g2 = _resolve_graph(graph_data=None, graph_uri="graph://test")
+
+        assert g1 is not g2
+        assert set(g2.nodes()) == {node["id"] for node in example_graph_data["nodes"]}
+
+    def test_recache_keeps_resolved_entries_consistent(self):
+        """Test that everything resolved from one cache entry stays from the same load when the alias is cached again."""
+        cache_graph("test", {"nodes": [{"id": "x"}, {"id": "y"}], "links": [{"source": "x", "target": "y"}]})
+        G, index = _resolve_attribute_query(None, "graph://test", "node")
+
+        cache_graph("test", {"nodes": [{"id": "z", "w": 1}], "links": []})
+
+        assert index is not None and index.ids == ["x", "y"] == list(G.nodes())
+        assert list(_resolve_graph(graph_data=None, graph_uri="graph://test")) == ["z"]
+
+    def test_cached_graph_json_does_not_replace_recached_json(self, monkeypatch):
+        """Test that JSON serialized while its alias is cached again is not kept for the new data."""
+        cache_graph("test", {"nodes": [{"id": "a"}], "links": []})
+        orjson_exact = cache_module._orjson_exact
+
+        def serialize_while_recached(data):
+            cache_graph("test", {"nodes": [{"id": "b"}], "links": []})  # a concurrent load of the alias
+            return orjson_exact(data)
+
+        monkeypatch.setattr(cache_module, "_orjson_exact", serialize_while_recached)
+        stale = get_cached_graph_json("test")
+        monkeypatch.undo()
+        current = get_cached_graph_json("test")
+
+        assert stale is not None and current is not None
+        assert [node["id"] for node in json.loads(stale)["nodes"]] == ["a"]
+        assert [node["id"] for node in json.loads(current)["nodes"]] == ["b"]
+
+    def test_resolve_graph_from_equal_data_is_cached(self, sample_graph_data):
+        """Test that inline graph data with identical content reuses the built graph."""
+        g1 = _resolve_graph(graph_data=sample_graph_data, graph_uri=None)
+        g2 = _resolve_graph(graph_data=json.loads(json.dumps(sample_graph_data)), graph_uri=None)
+
+        assert g1 is g2
+
+    def test_resolve_graph_shares_node_id_strings_with_edges(self):
+        """Test that edge ends refer to the same string objects as the node ids."""
+        graph_data = {
+            "nodes": [{"id": "source"}, {"id": "".join(["tar", "get"])}],
+            "links": [{"source": "source", "target": "".join(["targ", "et"])}],
+        }
+
+        G = _resolve_graph(graph_data=graph_data, graph_uri=None)
+
+        # Neighbor keys in the adjacency are the link's target objects, node keys the node ids
+        target = next(iter(G.adj["source"]))
+        assert target is next(n for n in G.nodes if n == "target")
+
+    def test_resolve_graph_distinguishes_nan_and_none(self):
+        """Test that inline data differing only in NaN vs None values are not served the same graph."""
+        g1 = _resolve_graph(graph_data={"nodes": [{"id": "a", "w": float("nan")}], "links": []}, graph_uri=None)
+        g2 = _resolve_graph(graph_data={"nodes": [{"id": "a", "w": None}], "links": []}, graph_uri=None)
+
+        assert g1 is not g2
+        assert g2.nodes["a"]["w"] is None
+
+    def test_resolve_graph_reuses_equal_inline_data(self):
+        """Test that equal inline data is served the same graph, whichever equal strings it shares."""
+        kind = "".join(["pu", "mp"])
+        shared = {"nodes": [{"id": "a", "kind": kind}, {"id": "b", "kind": kind}], "links": []}
+        distinct = {"nodes": [{"id": "a", "kind": "".join(["pu", "mp"])}, {"id": "b", "kind": "pump"}], "links": []}
+
+        assert _resolve_graph(graph_data=shared, graph_uri=None) is _resolve_graph(graph_data=distinct, graph_uri=None)
+
+    @pytest.mark.parametrize("builder", [_build_inline_graph, _build_inline_view])
+    def test_inline_memo_keys_drop_payload(self, builder):
+        """Test that the memoized key keeps only the digest once the graph or view is built."""
+        data = {"nodes": [{"id": "a", "w": 1}], "links": []}
+        key = _GraphDataKey(data)
+        built = builder(key)
+
+        assert key.graph_data is None
+        assert builder(_GraphDataKey({"nodes": [{"id": "a", "w": 1}], "links": []})) is built
+
+    def test_resolve_graph_interns_attribute_values(self):
+        """Test that equal string attribute values share one object in the built graph."""
+        graph_data = {
+            "nodes": [{"id": "a", "kind": "".join(["Ta", "nk"])}, {"id": "b", "kind": "".join(["Tan", "k"])}],
+            "links": [],
+        }
+
+        G = _resolve_graph(graph_data=graph_data, graph_uri=None)
+
+        assert G.nodes["a"]["kind"] is G.nodes["b"]["kind"]
+
     def test_resolve_graph_with_invalid_uri(self):
         """Test resolving a graph with an invalid URI format."""
         with pytest.raises(ValueError, match="Invalid graph URI"):
             _resolve_graph(graph_data=None, graph_uri="invalid://test")
 
+    def test_resolve_graph_strips_only_the_scheme(self, sample_graph_data):
+        """Test that only the leading 'graph://' is stripped from a URI."""
+        cache_graph("nested/graph://alias", sample_graph_data)
+
+        G = _resolve_graph(graph_data=None, graph_uri="graph://nested/graph://alias")
+
+        assert G is _loaded_graphs["nested/graph://alias"].graph
+
     def test_resolve_graph_with_nonexistent_alias(self):
         """Test resolving a graph with a non-existent alias."""
         with pytest.raises(ValueError, match="not found"):
             _resolve_graph(graph_data=None, graph_uri="graph://nonexistent")
 
 
+class TestLoadGraph:
+    """Test loading graphs from disk into the cache."""
+
+    def test_load_graph_caches_file(self):
+        """Test that loading a file caches it under the requested alias."""
+        result = _load_graph(str(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json"), "loaded")
+
+        assert isinstance(result, GraphCacheModel)
+        assert result.uri == "graph://loaded"
+        G = _resolve_graph(graph_data=None, graph_uri=result.uri)
+        assert G.number_of_nodes() > 0
+
+    def test_load_graph_builds_graph_once(self, monkeypatch):
+        """Test that the graph built while loading is cached instead of being built again."""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("graph rebuilt")
+
+        monkeypatch.setattr("src.cache._build_graph", fail)
+        result = _load_graph(str(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json"), "once")
+
+        assert isinstance(result, GraphCacheModel)
+        assert _resolve_graph(graph_data=None, graph_uri=result.uri) is _loaded_graphs["once"].graph
+
+    def test_load_graph_caches_validated_data(self, sample_graph_data):
+        """Test that the cached data equals the validated model's dump, with edges under 'links'."""
+        _load_graph(str(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json"), "dumped")
+
+        assert get_cached_graph("dumped") == GraphDataModel.model_validate(sample_graph_data).model_dump()
+
+    def test_load_graph_non_finite_floats(self):
+        """Test that files with NaN literals, as written by json.dump, load."""
+        result = _load_graph(str(pathlib.Path(__file__).parents[1] / "data/sap_supergraph.json"), "sap")
+
+        assert isinstance(result, GraphCacheModel)
+        assert _resolve_graph(graph_data=None, graph_uri=result.uri).number_of_nodes() > 0
+
+    @pytest.mark.parametrize("value", [123456789012345678901234, -(2**63) - 1, 2**64])
+    def test_load_graph_big_integers(self, tmp_path, value):
+        """Test that integers beyond 64 bits keep their exact value."""
+        path = tmp_path / "big.json"
+        path.write_text(f'{{"nodes": [{{"id": "a", "weight": {value}}}, {{"id": "b", "weight": 1.5}}], "links": []}}')
+        result = _load_graph(str(path), "big")
+
+        cached = get_cached_graph("big")
+        assert isinstance(result, GraphCacheModel) and cached is not None
+        assert cached["nodes"][0]["weight"] == value and isinstance(cached["nodes"][0]["weight"], int)
+        assert cached["nodes"][1]["weight"] == 1.5
+
+    def test_load_graph_missing_file(self):
+        """Test that loading a missing file returns an error."""
+        result = _load_graph("does/not/exist.json", "missing")
+
+        assert isinstance(result, ErrorModel)
+        assert "not found" in result.error.lower()
+
+    def test_load_graph_below_a_file(self, tmp_path):
+        """Test that a path through a regular file is reported as not found."""
+        parent = tmp_path / "graph.json"
+        parent.write_text("{}")
+        result = _load_graph(str(parent / "nested.json"), "nested")
+
+        assert isinstance(result, ErrorModel)
+        assert "not found" in result.error.lower()
+
+    def test_load_graph_permission_denied(self, tmp_path, monkeypatch):
+        """Test that an unreadable file is reported as such."""
+        path = tmp_path / "locked.json"
+        path.write_text("{}")
+
+        def read_bytes(self):
+            raise PermissionError(13, "Permission denied", str(self))
+
+        monkeypatch.setattr(pathlib.Path, "read_bytes", read_bytes)
+        result = _load_graph(str(path), "locked")
+
+        assert isinstance(result, ErrorModel)
+        assert result.error == f"Permission denied: {path}"
+
+    def test_load_graph_directory(self, tmp_path):
+        """Test that loading a directory returns an error."""
+        result = _load_graph(str(tmp_path), "directory")
+
+        assert isinstance(result, ErrorModel)
+        assert "not a file" in result.error.lower()
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="FIFOs need os.mkfifo")
+    def test_load_graph_fifo(self, tmp_path):
+        """Test that a FIFO is rejected instead of blocking on the read."""
+        fifo = tmp_path / "graph.fifo"
+        os.mkfifo(fifo)
+        result = _load_graph(str(fifo), "fifo")
+
+        assert isinstance(result, ErrorModel)
+        assert "not a file" in result.error.lower()
+
+    def test_load_graph_invalid_json(self, tmp_path):
+        """Test that loading a file with malformed JSON returns an error."""
+        file_path = tmp_path / "broken.json"
+        file_path.write_text('{"nodes": [')
+        result = _load_graph(str(file_path), "broken")
+
+        assert isinstance(result, ErrorModel)
+        assert result.error.startswith("Invalid JSON")
+
+
+class TestLoadAndMatch:
+    """Test the load_and_match tool through an in-memory MCP client."""
+
+    @staticmethod
+    def _call_tools(*calls: tuple[str, dict]) -> list:
+        """Call the tools in order in one client session and return their structured results."""
+        server = FastMCP("test")
+        register_tools(server)
+
+        async def run():
+            results = []
+            async with Client(server) as client:
+                for name, params in calls:
+                    structured = (await client.call_tool(name, params)).structured_content
+                    assert structured is not None
+                    results.append(structured["result"])
+            return results
+
+        return asyncio.run(run())
+
+    def test_load_and_match(self):
+        """Test that the matches are returned and the loaded graph is then usable by URI."""
+        path = str(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json")
+        matched, found = self._call_tools(
+            ("load_and_match", {"path": path, "alias": "matched", "attribute": "holdup"}),
+            (
+                "find_nodes_by_attribute",
+                {"uri": "graph://matched", "attribute": "holdup_max", "value": 100, "operator": "<"},
+            ),
+        )
+
+        assert "holdup_max" in matched["matching_attributes"]
+        assert all(attr.startswith("holdup") for attr in matched["matching_attributes"])
+        assert found["matches"]
+        assert _resolve_graph(graph_data=None, graph_uri="graph://matched").number_of_nodes() > 0
+
+    def test_load_and_match_missing_file(self):
+        """Test that a missing file is reported as an error and nothing is cached."""
+        (result,) = self._call_tools(
+            ("load_and_match", {"path": "does/not/exist.json", "alias": "gone", "attribute": "x"})
+        )
+
+        assert "not found" in result["error"].lower()
+        assert get_cached_graph("gone") is None
+
+    @pytest.mark.parametrize("top_k", [0, -1])
+    def test_load_and_match_rejects_non_positive_top_k(self, top_k):
+        """Test that top_k below 1 is rejected before the graph is loaded."""
+        path = str(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json")
+        with pytest.raises(ToolError):
+            self._call_tools(("load_and_match", {"path": path, "alias": "bad", "attribute": "", "top_k": top_k}))
+
+        assert get_cached_graph("bad") is None
+
+    @pytest.mark.parametrize("tool", ["load_and_match", "find_best_matching_node_attribute"])
+    def test_top_k_bounded_in_tool_schema(self, tool):
+        """Test that top_k is validated at the tool signature, so clients see the bound up front."""
+        server = FastMCP("test")
+        register_tools(server)
+
+        async def run():
+            async with Client(server) as client:
+                return {listed.name: listed.inputSchema for listed in await client.list_tools()}
+
+        top_k = asyncio.run(run())[tool]["properties"]["top_k"]
+
+        assert {"minimum": 1, "type": "integer"} in top_k["anyOf"]
+
+
 class TestShortestPath:
     """Test shortest path functionality."""
 
@@ -156,6 +440,116 @@ class TestShortestPath:
         with pytest.raises((nx.NodeNotFound, KeyError)):
             nx.shortest_path(example_graph, source="0", target="nonexistent_node")
 
+    @pytest.mark.parametrize("source,target", [("0", "19"), ("0", "0"), ("3", "12")])
+    def test_shortest_path_matches_networkx(self, example_graph, source, target):
+        """Test that the tool's path search finds a path as short as nx.shortest_path."""
+        path = NetworkXGraph.shortest_path(example_graph, source, target)
+
+        assert path[0] == source and path[-1] == target
+        assert len(path) == len(nx.shortest_path(example_graph, source, target))
+        assert all(example_graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+
+    def test_shortest_path_respects_direction(self, example_graph):
+        """Test that directed graphs are only searched along edge direction."""
+        with pytest.raises(nx.NetworkXNoPath):
+            NetworkXGraph.shortest_path(example_graph, "19", "0")
+
+    def test_shortest_path_same_missing_node(self, example_graph):
+        """Test that the source == target fast path still rejects unknown nodes."""
+        with pytest.raises(nx.NodeNotFound):
+            NetworkXGraph.shortest_path(example_graph, "nonexistent_node", "nonexistent_node")
+
+    def test_shortest_path_missing_target(self, example_graph):
+        """Test that an unknown target is reported as NodeNotFound, not as a missing path."""
+        with pytest.raises(nx.NodeNotFound):
+            NetworkXGraph.shortest_path(example_graph, "0", "nonexistent_node")
+
+    @pytest.mark.parametrize("graph_type", [nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph])
+    def test_bfs_path_matches_bidirectional_search(self, example_graph, graph_type):
+        """Test that bfs_path and the indexed search return the same path as nx.bidirectional_shortest_path."""
+        G = graph_type(example_graph)
+        adjacency = IndexedAdjacency(G)
+
+        for source in G:
+            for target in G:
+                try:
+                    expected = nx.bidirectional_shortest_path(G, source, target)
+                except nx.NetworkXNoPath:
+                    expected = None
+                assert bfs_path(G, source, target) == expected
+                assert adjacency.path(source, target) == expected
+
+    @pytest.mark.parametrize(
+        "G", [nx.grid_2d_graph(5, 5), nx.complete_graph(6), nx.cycle_graph(7, create_using=nx.DiGraph)]
+    )
+    def test_bfs_path_matches_bidirectional_search_with_revisits(self, G):
+        """Test that skipping already reached neighbors keeps the paths of nx.bidirectional_shortest_path."""
+        adjacency = IndexedAdjacency(G)
+
+        for source in G:
+            for target in G:
+                expected = nx.bidirectional_shortest_path(G, source, target)
+                assert bfs_path(G, source, target) == expected
+                assert adjacency.path(source, target) == expected
+
+    def test_cached_graph_adjacency(self, example_graph_data):
+        """Test that the indexed adjacency is built at cache time, and only for cached graphs."""
+        cache_graph("indexed", example_graph_data, graph=Graph(GraphDataModel.model_validate(example_graph_data)).graph)
+        G, adjacency = _resolve_path_graph(None, "graph://indexed")
+
+        assert adjacency is not None
+        assert G is _resolve_graph(None, "graph://indexed")
+        assert _resolve_path_graph(None, "graph://indexed")[1] is adjacency
+        assert adjacency.nodes == list(G)
+        assert _resolve_path_graph(example_graph_data, None)[1] is None
+        with pytest.raises(ValueError, match="not found"):
+            _resolve_path_graph(None, "graph://nonexistent")
+        assert NetworkXGraph.shortest_path(G, "0", "19", adjacency=adjacency) == NetworkXGraph.shortest_path(
+            G, "0", "19"
+        )
+
+    def test_shortest_path_with_adjacency_of_recached_alias(self):
+        """Test that a graph resolved before its alias is cached again keeps its own adjacency."""
+        cache_graph("a", {"nodes": [{"id": "x"}, {"id": "y"}], "links": [{"source": "x", "target": "y"}]})
+        G, adjacency = _resolve_path_graph(None, "graph://a")
+        cache_graph("a", {"nodes": [{"id": "z"}], "links": []})
+
+        assert NetworkXGraph.shortest_path(G, "x", "y", adjacency=adjacency) == ["x", "y"]
+        with pytest.raises(nx.NodeNotFound):
+            NetworkXGraph.shortest_path(G, "x", "y", adjacency=_resolve_path_graph(None, "graph://a")[1])
+
+
+class TestTypeCast:
+    """Test casting of filter values."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("6", 6.0),
+            ("-0.5", -0.5),
+            ("1e3", 1000.0),
+            (".5", 0.5),
+            (" 100", 100.0),
+            ("1_000", 1000.0),
+            ("inf", float("inf")),
+            (3, 3.0),
+            (2.5, 2.5),
+            ("Tank", "Tank"),
+            ("", ""),
+        ],
+    )
+    def test_type_cast(self, value, expected):
+        """Test that everything float() accepts becomes a float and other strings are kept."""
+        result = NetworkXGraph.type_cast(value)
+
+        assert result == expected
+        assert type(result) is type(expected)
+
+    def test_type_cast_passes_through_other_values(self):
+        """Test that None and non-scalar values are returned unchanged."""
+        assert NetworkXGraph.type_cast(None) is None
+        assert NetworkXGraph.type_cast([]) == []
+
 
 class TestNodesByAttribute:
     """Test finding nodes by attribute."""
@@ -182,6 +576,42 @@ class TestNodesByAttribute:
             if node_value is not None:
                 assert validator(node_value, value)
 
+    @pytest.mark.parametrize(
+        "nodes,value",
+        [
+            ([("a", {"w": 1}), ("b", {"w": 2.5}), ("c", {}), ("d", {"w": True}), ("e", {"w": 7})], 2.5),
+            # Integers beyond 2**53, which float64 rounds
+            ([("a", {"w": 2**53 + 1}), ("b", {"w": 1})], 2**53),
+            # The same integer mixed with a float, which makes np.array round it
+            ([("a", {"w": 2**53 + 1}), ("b", {"w": 0.5})], str(2**53)),
+        ],
+    )
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_find_nodes_numeric_matches_python_semantics(self, operator, nodes, value):
+        """Test that numeric filtering returns the same nodes, in order, as a plain Python scan."""
+        G = nx.DiGraph()
+        G.add_nodes_from(nodes)
+
+        result = NetworkXGraph.nodes_by_attribute(G, "w", value, operator)
+
+        expected = [n for n, w in G.nodes(data="w") if w is not None and operator_map[operator](w, float(value))]
+        assert result == expected
+
+    @pytest.mark.parametrize("value", [" 100", "1_00", "1e2"])
+    def test_find_nodes_numeric_string_spellings(self, sample_graph, value):
+        """Test that any string float() accepts is compared as a number."""
+        expected = NetworkXGraph.nodes_by_attribute(sample_graph, "holdup_max", 100.0, "<")
+
+        assert expected
+        assert NetworkXGraph.nodes_by_attribute(sample_graph, "holdup_max", value, "<") == expected
+
+    def test_find_nodes_mixed_type_attribute(self):
+        """Test that non-numeric attribute values fall back to Python comparisons."""
+        G = nx.DiGraph()
+        G.add_nodes_from([("a", {"w": 1}), ("b", {"w": "1"}), ("c", {"w": [1]})])
+
+        assert NetworkXGraph.nodes_by_attribute(G, "w", 1.0, "==") == ["a"]
+
     def test_find_nodes_attribute_not_exists(self, sample_graph):
         """Test finding nodes by non-existent attribute."""
         result = NetworkXGraph.nodes_by_attribute(sample_graph, "nonexistent_attr", "value", "==")
@@ -214,12 +644,156 @@ class TestEdgesByAttribute:
             if edge_value is not None:
                 assert validator(edge_value, value)
 
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_find_multigraph_edges_string_values(self, operator):
+        """Test that string filtering on a MultiGraph returns (u, v, key) edges like a plain Python scan."""
+        G = nx.MultiDiGraph()
+        G.add_edges_from([("a", "b", {"kind": "pipe"}), ("a", "b", {"kind": "valve"}), ("b", "c", {})])
+
+        result = NetworkXGraph.edges_by_attribute(G, "kind", "pipe", operator)
+
+        expected = [
+            (u, v, k)
+            for u, v, k, kind in G.edges(keys=True, data="kind")
+            if kind is not None and operator_map[operator](kind, "pipe")
+        ]
+        assert result == expected
+
+    @pytest.mark.parametrize("value", ["pipe", None])
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_find_simple_graph_edges_string_values(self, operator, value):
+        """Test that string and presence filtering on an undirected Graph returns (u, v) edges like a plain scan."""
+        G = nx.Graph()
+        G.add_edges_from([("b", "a", {"kind": "pipe"}), ("a", "c", {"kind": "valve"}), ("c", "d", {})])
+
+        result = NetworkXGraph.edges_by_attribute(G, "kind", value, operator)
+
+        expected = [
+            (u, v)
+            for u, v, kind in G.edges(data="kind")
+            if kind is not None and (value is None or operator_map[operator](kind, value))
+        ]
+        assert result == expected
+
     def test_find_edges_attribute_not_exists(self, sample_graph):
         """Test finding edges by non-existent attribute."""
         result = NetworkXGraph.edges_by_attribute(sample_graph, "nonexistent_attr", "value", "==")
         assert isinstance(result, list)
 
 
+class TestAttributeIndex:
+    """Test that indexed attribute lookups agree with full scans."""
+
+    @pytest.mark.parametrize(
+        "attribute,value",
+        [("object_type", "Tank"), ("holdup_max", 10.0), ("holdup", 5), ("demand", None), ("nonexistent_attr", 1)],
+    )
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_node_index_matches_scan(self, sample_graph, attribute, value, operator):
+        """Test indexed node lookups against the unindexed scan."""
+        index = AttributeIndex(sample_graph.nodes(data=True))
+        try:
+            expected = NetworkXGraph.nodes_by_attribute(sample_graph, attribute, value, operator)
+        except TypeError:
+            pytest.skip("Values are not comparable with this operator")
+
+        assert NetworkXGraph.nodes_by_attribute(sample_graph, attribute, value, operator, index=index) == expected
+
+    @pytest.mark.parametrize("value", [0, 10, 15.5, None])
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_edge_index_matches_scan(self, sample_graph, value, operator):
+        """Test indexed edge lookups against the unindexed scan."""
+        index = AttributeIndex(NetworkXGraph.edge_items(sample_graph))
+        expected = NetworkXGraph.edges_by_attribute(sample_graph, "capacity", value, operator)
+
+        assert NetworkXGraph.edges_by_attribute(sample_graph, "capacity", value, operator, index=index) == expected
+
+    @pytest.mark.parametrize("value", [-1.0, 12.0, 50.0, 99.0])
+    @pytest.mark.parametrize("operator", ["!=", "<", "<=", ">", ">="])
+    def test_dense_scan_matches_scan(self, operator, value):
+        """Test that range lookups answered by the dense column scan agree with the unindexed scan."""
+        G = nx.Graph()
+        G.add_nodes_from((i, {"weight": (i * 37) % 100} if i % 3 else {}) for i in range(300))
+        index = AttributeIndex(G.nodes(data=True))
+        expected = NetworkXGraph.nodes_by_attribute(G, "weight", value, operator)
+
+        assert NetworkXGraph.nodes_by_attribute(G, "weight", value, operator, index=index) == expected
+
+    # The other value is an int, or a float which makes np.array round the big integer
+    @pytest.mark.parametrize("other", [1, 0.5])
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_index_big_integers_match_scan(self, operator, other):
+        """Test that integers beyond 2**53, which float64 rounds, are looked up with Python semantics."""
+        G = nx.Graph()
+        G.add_nodes_from([(0, {"w": 2**53 + 1}), (1, {"w": other})])
+        index = AttributeIndex(G.nodes(data=True))
+        expected = [n for n, w in G.nodes(data="w") if operator_map[operator](w, float(2**53))]
+
+        assert NetworkXGraph.nodes_by_attribute(G, "w", 2**53, operator, index=index) == expected
+        column = index._column("w")
+        assert column is not None and column.dense is None and column.sorted_values is None
+
+    @pytest.mark.parametrize("values", [[i % 7 for i in range(70_000)], [i % 2 == 0 for i in range(70_000)]])
+    @pytest.mark.parametrize("operator", ["==", "!=", "<", "<=", ">", ">="])
+    def test_parallel_scan_matches_numpy(self, values, operator):
+        """Test that the compiled parallel column scan agrees with the NumPy scan."""
+        pytest.importorskip("numba")
+        index = AttributeIndex((i, {"w": val} if i % 10 else {}) for i, val in enumerate(values))
+        column = index._column("w")
+        assert column is not None and column.dense is not None
+        expected = np.flatnonzero(np_operator_map[operator](column.dense, 1.0) & column.present)
+
+        assert np.array_equal(column.scan(1.0, operator), expected)
+
+    def test_parallel_scan_from_concurrent_threads(self):
+        """Test that concurrent scans survive numba's workqueue layer, which aborts on concurrent launches."""
+        pytest.importorskip("numba")
+        script = """
+import threading
+from src.base.attribute_index import AttributeIndex
+column = AttributeIndex((i, {"w": i % 7}) for i in range(100_000))._column("w")
+threads = [threading.Thread(target=lambda: [column.scan(1.0, "<") for _ in range(20)]) for _ in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print("done")
+"""
+        env = {**os.environ, "NUMBA_THREADING_LAYER": "workqueue"}
+        result = subprocess.run(  # noqa: S603 - a fixed script run by the current interpreter
+            [sys.executable, "-c", script],
+            cwd=pathlib.Path(__file__).parents[1],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "done"
+
+    def test_index_builds_columns_on_first_query(self, sample_graph):
+        """Test that attribute lookup tables are only built for queried attributes."""
+        index = AttributeIndex(sample_graph.nodes(data=True))
+        assert index._columns == {}
+
+        index.lookup("holdup_max", 10.0, ">")
+        index.lookup("nonexistent_attr", None, "==")
+
+        assert set(index._columns) == {"holdup_max", "nonexistent_attr"}
+
+    def test_cached_graph_has_index(self, sample_graph_data):
+        """Test that caching a graph makes its attribute indices available by URI."""
+        cache_graph("indexed", sample_graph_data)
+
+        for kind in ("node", "edge"):
+            G, index = _resolve_attribute_query(None, "graph://indexed", kind)
+            assert G is _resolve_graph(graph_data=None, graph_uri="graph://indexed")
+            assert isinstance(index, AttributeIndex)
+        assert _resolve_attribute_query(sample_graph_data, None, "node")[1] is None
+        with pytest.raises(ValueError, match="not found"):
+            _resolve_attribute_query(None, "graph://nonexistent", "node")
+
+
 class TestAttributeDiscovery:
     """Test attribute discovery functionality."""
 
@@ -250,6 +824,98 @@ class TestAttributeDiscovery:
 
         assert matches_upper == matches_lower
 
+    def test_fuzzy_attribute_search(self, sample_graph):
+        """Test that near-matches are found and exact substring matches rank first."""
+        matches = NetworkXGraph.matching_attributes(sample_graph, "holdpu", type="node")
+
+        assert "holdup_max" in matches
+        assert "object_type" not in matches
+
+    @pytest.mark.parametrize(
+        "search_term, names, expected",
+        [
+            ("capacity_max", ["x", "holdup_max"], []),
+            ("xx", ["x"], []),
+            ("object_type", ["type", "object_typ"], ["object_typ"]),
+        ],
+    )
+    def test_attribute_search_longer_than_name(self, sample_graph, search_term, names, expected):
+        """Test that names shorter than the search term only match when they are close to all of it."""
+        matches = NetworkXGraph.matching_attributes(sample_graph, search_term, type="node", names=names)
+
+        assert matches == expected
+
+    def test_substring_matches_rank_first(self, sample_graph):
+        """Test that names containing the search term come before near-matches of any length."""
+        names = ["holdup", "holdup_max", "holdu", "capacity"]
+        matches = NetworkXGraph.matching_attributes(sample_graph, "holdup", type="node", names=names)
+
+        assert matches[:2] == ["holdup", "holdup_max"]
+        assert "holdu" in matches[2:]
+        assert "capacity" not in matches
+
+    @pytest.mark.parametrize("limit", [1, 2, 100])
+    def test_attribute_search_limit(self, sample_graph, limit):
+        """Test that limiting the results returns the top of the full ranking."""
+        all_matches = NetworkXGraph.matching_attributes(sample_graph, "holdpu", type="node")
+        matches = NetworkXGraph.matching_attributes(sample_graph, "holdpu", type="node", limit=limit)
+
+        assert matches == all_matches[:limit]
+
+    @pytest.mark.parametrize("limit", [None, 2])
+    def test_empty_attribute_search_lists_names_once(self, sample_graph, limit):
+        """Test that an empty search string returns the attribute names, each once."""
+        names = NetworkXGraph.attribute_names(sample_graph, "all")
+        matches = NetworkXGraph.matching_attributes(sample_graph, "", type="all", limit=limit)
+
+        assert len(matches) == len(set(matches)) == (len(names) if limit is None else limit)
+        assert set(matches) <= names
+
+    def test_attribute_search_with_cached_names(self, sample_graph_data, sample_graph):
+        """Test that cached attribute names give the same matches as a graph scan."""
+        cache_graph("names", sample_graph_data)
+
+        for element_type in ("node", "edge", "all"):
+            names = _loaded_graphs["names"].names[element_type]
+            assert names == {name: name.lower() for name in NetworkXGraph.attribute_names(sample_graph, element_type)}
+            assert sorted(
+                NetworkXGraph.matching_attributes(sample_graph, "o", type=element_type, names=names)
+            ) == sorted(NetworkXGraph.matching_attributes(sample_graph, "o", type=element_type))
+
+    def test_all_attribute_names_precomputed(self, sample_graph_data):
+        """Test that the union of node and edge attribute names is computed once at cache time."""
+        cache_graph("union", sample_graph_data)
+        names = _loaded_graphs["union"].names
+
+        assert names["all"] == names["node"] | names["edge"]
+
+    def test_best_matches_memoized_until_recached(self, sample_graph_data, example_graph_data):
+        """Test that memoized matches are dropped when the alias is cached again."""
+        cache_graph("matches", sample_graph_data)
+        matches = _resolve_best_matches(None, "graph://matches", "holdup", "node")
+        assert "holdup_max" in matches
+        assert _resolve_best_matches(None, "graph://matches", "holdup", "node") == matches
+
+        cache_graph("matches", example_graph_data)
+        assert _resolve_best_matches(None, "graph://matches", "holdup", "node") == []
+
+    def test_best_matches_use_names_collected_at_cache_time(self, sample_graph_data, monkeypatch):
+        """Test that matching against a cached graph neither rescans it nor returns duplicates."""
+        cache_graph("collected", sample_graph_data)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("attribute names collected again")
+
+        monkeypatch.setattr(NetworkXGraph, "attribute_names", fail)
+        for element_type in ("node", "edge", "all"):
+            matches = _resolve_best_matches(None, "graph://collected", "a", element_type)
+            assert len(matches) == len(set(matches))
+
+    def test_best_matches_unknown_uri(self):
+        """Test that matching against an uncached URI raises ValueError."""
+        with pytest.raises(ValueError, match="not found"):
+            _resolve_best_matches(None, "graph://nonexistent", "holdup", "node")
+
 
 class TestIntegrationScenarios:
     """Integration tests combining multiple operations."""
@@ -1,27 +1,20 @@
 """Tests for MCP resources."""
 
 import json
-import pathlib
 
+import orjson
 import pytest
 
-from src.cache import _loaded_graphs, cache_graph
+from src.cache import cache_graph, clear_cache
 from src.resources import get_graph_resource
 
 
-@pytest.fixture
-def sample_graph_data():
-    """Load sample graph data from file."""
-    with open(pathlib.Path(__file__).parents[1] / "data/sample_graph_attr.json") as f:
-        return json.load(f)
-
-
 @pytest.fixture(autouse=True)
-def clear_cache():
+def clear_graph_cache():
     """Clear the graph cache before and after each test."""
-    _loaded_graphs.clear()
+    clear_cache()
     yield
-    _loaded_graphs.clear()
+    clear_cache()
 
 
 def test_get_graph_resource_found(sample_graph_data):
@@ -52,6 +45,15 @@ def test_get_graph_resource_not_found():
     assert "not found" in result_data["error"].lower()
 
 
+def test_get_graph_resource_after_clear(sample_graph_data):
+    """Test that a graph read before clear_cache is not served afterwards."""
+    cache_graph("cleared", sample_graph_data)
+    get_graph_resource(alias="cleared")
+    clear_cache()
+
+    assert "not found" in json.loads(get_graph_resource(alias="cleared"))["error"].lower()
+
+
 def test_get_graph_resource_multiple_graphs(sample_graph_data):
     """Test retrieving different cached graphs."""
     # Cache multiple graphs
@@ -84,3 +86,51 @@ def test_cache_persistence():
     assert result1 == test_data
     assert result2 == test_data
     assert result1 == result2
+
+
+def test_get_graph_resource_after_recache():
+    """Test that re-caching an alias replaces the served resource."""
+    cache_graph("replaced", {"nodes": [{"id": "a"}], "links": []})
+    first = json.loads(get_graph_resource(alias="replaced"))
+
+    new_data = {"nodes": [{"id": "b"}], "links": []}
+    cache_graph("replaced", new_data)
+    second = json.loads(get_graph_resource(alias="replaced"))
+
+    assert first != second
+    assert second == new_data
+
+
+def test_get_graph_resource_reuses_serialization(sample_graph_data):
+    """Test that repeated reads serve the same serialized text instead of encoding again."""
+    cache_graph("serialized", sample_graph_data)
+
+    assert get_graph_resource(alias="serialized") is get_graph_resource(alias="serialized")
+
+
+def test_get_graph_resource_not_cached_across_recache(monkeypatch):
+    """Test that text serialized while the alias is cached again is not served for the new data."""
+    cache_graph("raced", {"nodes": [{"id": "a"}], "links": []})
+    new_data = {"nodes": [{"id": "b"}], "links": []}
+    dumps = orjson.dumps
+
+    def dumps_while_recached(*args, **kwargs):
+        cache_graph("raced", new_data)  # a concurrent load of the alias
+        return dumps(*args, **kwargs)
+
+    monkeypatch.setattr(orjson, "dumps", dumps_while_recached)
+    get_graph_resource(alias="raced")
+    monkeypatch.undo()
+
+    assert json.loads(get_graph_resource(alias="raced")) == new_data
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), 2**70, -(2**63) - 1])
+def test_get_graph_resource_keeps_values_orjson_cannot_encode(value):
+    """Test that non-finite floats and integers beyond 64 bits are served unchanged."""
+    cache_graph("exact", {"nodes": [{"id": "a", "weight": value}, {"id": "b", "weight": 1.5}], "links": []})
+    nodes = json.loads(get_graph_resource(alias="exact"))["nodes"]
+
+    # NaN != NaN, so compare the text of the served values
+    assert repr(nodes[0]["weight"]) == repr(value)
+    assert nodes[1]["weight"] == 1.5